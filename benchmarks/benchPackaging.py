@@ -0,0 +1,280 @@
+import argparse
+import json
+import os
+import shutil
+import sys
+import tempfile
+import threading
+import time
+
+from contextlib import contextmanager
+
+from statics import *
+from core.build import BuildUp
+from .fakeDocker import FakeDockerClient, syntheticBlocks
+
+# Runs the packaging pipeline against an in-process fake Docker client, no daemon and no display needed.
+# Usage from the repository root: python -m benchmarks.benchPackaging [options]
+
+MEGABYTE = 1048576
+
+def readRss() -> int:
+
+    try:
+
+        with open("/proc/self/status", "r") as f:
+
+            for line in f:
+
+                if line.startswith("VmRSS:"):
+
+                    return int(line.split()[1]) * 1024
+
+    except OSError:
+
+        pass
+
+    return 0
+
+def directorySize(path: str) -> int:
+
+    totalSize = 0
+
+    for rootPath, dirNames, fileNames in os.walk(path):
+
+        for fileName in fileNames:
+
+            try:
+
+                totalSize += os.lstat(os.path.join(rootPath, fileName)).st_size
+
+            except FileNotFoundError:
+
+                # Partial archives are renamed while the sampler walks
+
+                continue
+
+    return totalSize
+
+class ResourceSampler:
+
+    def __init__(self, diskPath: str, interval: float = 0.02):
+
+        self.diskPath = diskPath
+        self.interval = interval
+        self.records = []
+        self.peakRss = 0
+        self.peakDisk = 0
+
+    def sampleOnce(self):
+
+        self.peakRss = max(self.peakRss, readRss())
+        self.peakDisk = max(self.peakDisk, directorySize(self.diskPath))
+
+    def sample(self, stopEvent: threading.Event):
+
+        while not stopEvent.wait(self.interval):
+
+            self.sampleOnce()
+
+    @contextmanager
+    def measure(self, phaseName: str):
+
+        # The caller sets record["Bytes"] to the bytes the phase processed
+
+        record = {"Phase": phaseName, "Bytes": 0}
+        baseDisk = directorySize(self.diskPath)
+        self.peakRss = readRss()
+        self.peakDisk = baseDisk
+        stopEvent = threading.Event()
+        samplerThread = threading.Thread(target=self.sample, args=(stopEvent,), daemon=True)
+        startTime = time.perf_counter()
+        samplerThread.start()
+
+        try:
+
+            yield record
+
+        finally:
+
+            seconds = time.perf_counter() - startTime
+            stopEvent.set()
+            samplerThread.join()
+            self.sampleOnce()
+            record["Seconds"] = round(seconds, 3)
+            record["MBps"] = round(record["Bytes"] / MEGABYTE / seconds, 2) if seconds > 0 else 0.0
+            record["PeakRssMB"] = round(self.peakRss / MEGABYTE, 1)
+            record["PeakDiskMB"] = round((self.peakDisk - baseDisk) / MEGABYTE, 1)
+            self.records.append(record)
+
+    def summary(self) -> str:
+
+        summaryLines = [f"{'Phase':<26} {'Seconds':>9} {'MB':>10} {'MB/s':>9} {'Peak RSS MB':>12} {'Peak disk MB':>13}"]
+
+        for record in self.records:
+
+            summaryLines.append(f"{record['Phase']:<26} {record['Seconds']:>9.2f} {record['Bytes'] / MEGABYTE:>10.1f} {record['MBps']:>9.1f} {record['PeakRssMB']:>12.1f} {record['PeakDiskMB']:>13.1f}")
+
+        return "\n".join(summaryLines)
+
+def createVolumeTree(volumePath: str, fileCount: int, fileSize: int, compressibility: float) -> int:
+
+    for index in range(fileCount):
+
+        directoryPath = os.path.join(volumePath, f"dir_{index % 16}")
+        os.makedirs(directoryPath, exist_ok=True)
+
+        with open(os.path.join(directoryPath, f"file_{index}.bin"), "wb") as f:
+
+            for block in syntheticBlocks(fileSize, compressibility, f"{volumePath}-{index}"):
+
+                f.write(block)
+
+    return fileCount * fileSize
+
+def writeConfig(workDirectory: str, arguments, imageConfigList: list):
+
+    packageSettings = {
+        KEY_OUTPUT_DIRECTORY: os.path.join(workDirectory, "packages"),
+        KEY_COMPRESSION: arguments.compression,
+        KEY_COMPRESSION_LEVEL: arguments.level,
+        KEY_COMPRESSION_THREADS: arguments.threads,
+        KEY_COMBINED_SAVE: False
+    }
+    configData = {
+        KEY_OP_LOGGER: {
+            "ConsoleLogLevel": "WARN",
+            "FileLogLevel": "INFO",
+            "MaxLogSize": 3,
+            KEY_LOG_DIRECTORY: os.path.join(workDirectory, "logs"),
+            "FileEncoding": "utf-8"
+        },
+        KEY_OP_APPLICATION: {
+            KEY_OP_IMAGES: imageConfigList,
+            KEY_OP_BUILD: {},
+            KEY_OP_PACKAGE: packageSettings
+        }
+    }
+
+    with open(os.path.join(workDirectory, "config.json"), "w") as f:
+        json.dump(configData, f, indent=4)
+
+def parseArguments(argv: list | None = None):
+
+    parser = argparse.ArgumentParser(description="Benchmark the packaging pipeline against a fake Docker client.")
+    parser.add_argument("--images", type=int, default=4, help="number of synthetic images")
+    parser.add_argument("--image-size", type=float, default=64, help="size of each image's own layer in MB")
+    parser.add_argument("--shared-size", type=float, default=32, help="size of the base layer shared by every image in MB")
+    parser.add_argument("--compressibility", type=float, default=0.5, help="share of each data block that compresses away, 0.0 to 1.0")
+    parser.add_argument("--volume-files", type=int, default=200, help="files in each image's synthetic volume")
+    parser.add_argument("--volume-file-size", type=float, default=256, help="size of each volume file in KB")
+    parser.add_argument("--compression", default="gzip", help="package compression codec")
+    parser.add_argument("--level", type=int, default=None, help="compression level")
+    parser.add_argument("--threads", type=int, default=0, help="gzip compression threads, 0 for automatic")
+    parser.add_argument("--work-dir", default=None, help="directory for synthetic data and packages, a temporary directory by default")
+    parser.add_argument("--json", default=None, help="write the results to this JSON file")
+    parser.add_argument("--keep", action="store_true", help="keep the temporary work directory")
+
+    return parser.parse_args(argv)
+
+def runBenchmark(arguments) -> dict:
+
+    # Only a temporary work directory is removed afterwards, a given one is left in place
+
+    removeWorkDirectory = arguments.work_dir is None and not arguments.keep
+    workDirectory = os.path.abspath(arguments.work_dir or tempfile.mkdtemp(prefix="packaging-bench-"))
+    os.makedirs(workDirectory, exist_ok=True)
+    client = FakeDockerClient()
+    imageConfigList = []
+    volumeBytes = 0
+
+    for index in range(arguments.images):
+
+        baseImage = f"bench-image{index}"
+        client.images.create(f"{baseImage}:latest", int(arguments.image_size * MEGABYTE), arguments.compressibility, int(arguments.shared_size * MEGABYTE))
+        volumePath = os.path.join(workDirectory, "volumes", f"image{index}")
+        volumeBytes += createVolumeTree(volumePath, arguments.volume_files, int(arguments.volume_file_size * 1024), arguments.compressibility)
+        imageConfigList.append({KEY_NAME: f"Bench Image {index}", KEY_BASE_IMAGE: baseImage, KEY_VERSION: "1.0.0", KEY_VOLUMES: [volumePath]})
+
+    writeConfig(workDirectory, arguments, imageConfigList)
+    imageBytes = sum(client.images.get(f"{imageConfig[KEY_BASE_IMAGE]}:latest").attrs["Size"] for imageConfig in imageConfigList)
+    uniqueImageBytes = int((arguments.images * arguments.image_size + arguments.shared_size * (arguments.images > 0)) * MEGABYTE)
+    workingDirectory = os.getcwd()
+    os.chdir(workDirectory)
+
+    try:
+
+        buildUp = BuildUp({}, None, client)
+        sampler = ResourceSampler(workDirectory)
+
+        for imageConfig in imageConfigList:
+
+            packagePath = os.path.join(buildUp.packagePath, f"{imageConfig[KEY_BASE_IMAGE]}_latest")
+            buildUp.builtImageList.append([imageConfig[KEY_NAME], packagePath, f"{imageConfig[KEY_BASE_IMAGE]}:latest", True, imageConfig[KEY_VOLUMES]])
+
+        with sampler.measure("packageImages") as record:
+
+            buildUp.packageImages()
+            record["Bytes"] = imageBytes + volumeBytes
+
+        # packageImages reports failures per image and carries on, a benchmark must not
+
+        packageArchiveList = [buildUp.findPackageArchive(packageSet[1]) for packageSet in buildUp.builtImageList]
+
+        if None in packageArchiveList:
+
+            raise RuntimeError("Packaging failed for at least one synthetic image.")
+
+        with sampler.measure("createArchive") as record:
+
+            buildUp.createArchive(os.path.join(buildUp.packagePath, "volumes"), [imageConfig[KEY_VOLUMES][0] for imageConfig in imageConfigList])
+            record["Bytes"] = volumeBytes
+
+        with sampler.measure("packageAllImages") as record:
+
+            buildUp.packageAllImages()
+            record["Bytes"] = sum(os.path.getsize(packageArchive) for packageArchive in packageArchiveList)
+
+        buildUp.packageSettings = {**buildUp.packageSettings, KEY_COMBINED_SAVE: True}
+
+        with sampler.measure("packageAllImagesCombined") as record:
+
+            buildUp.packageAllImages()
+            record["Bytes"] = uniqueImageBytes
+
+        buildUp.progressBus.close()
+
+        return {
+            "Arguments": vars(arguments),
+            "Phases": sampler.records,
+            "PipelinePhases": buildUp.metrics.records,
+            "Summary": sampler.summary(),
+            "PipelineSummary": buildUp.metrics.summary()
+        }
+
+    finally:
+
+        os.chdir(workingDirectory)
+
+        if removeWorkDirectory:
+
+            shutil.rmtree(workDirectory, ignore_errors=True)
+
+def main(argv: list | None = None) -> int:
+
+    arguments = parseArguments(argv)
+    results = runBenchmark(arguments)
+    print(results["PipelineSummary"])
+    print()
+    print(results["Summary"])
+
+    if arguments.json is not None:
+
+        with open(arguments.json, "w") as f:
+            json.dump({key: value for key, value in results.items() if not key.endswith("Summary")}, f, indent=4)
+
+    return 0
+
+if __name__ == "__main__":
+
+    sys.exit(main())
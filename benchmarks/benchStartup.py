@@ -0,0 +1,100 @@
+import argparse
+import os
+import statistics
+import subprocess
+import sys
+
+# Measures the cold import cost of the UI entry module with -X importtime.
+# Usage from the repository root: python -m benchmarks.benchStartup [options]
+
+STARTUP_BUDGET_MS = 400
+ENTRY_MODULE = "docker_builder_ui"
+
+# Loaded on first build or test, never before the first window paints
+DEFERRED_MODULES = ["docker", "core.build", "core.test", "ui.menu.testMenu", "ui.dialog"]
+
+def measureImportTime(entryModule: str) -> dict:
+
+    # Each run is a fresh interpreter so nothing is served from an already imported module
+
+    repositoryPath = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+    result = subprocess.run(
+        [sys.executable, "-X", "importtime", "-c", f"import {entryModule}"],
+        cwd=repositoryPath,
+        capture_output=True,
+        text=True
+    )
+
+    if result.returncode != 0:
+
+        raise RuntimeError(f"Importing {entryModule} failed:\n{result.stderr}")
+
+    # Nested imports are reported before the top-level import that triggered them.
+    # Only the tree below the entry module counts, interpreter start-up imports such as site do not.
+
+    pendingTimes = {}
+    moduleTimes = {}
+
+    for line in result.stderr.splitlines():
+
+        if not line.startswith("import time:") or "imported package" in line:
+
+            continue
+
+        selfTime, cumulativeTime, moduleText = line[len("import time:"):].split("|")
+        pendingTimes[moduleText.strip()] = int(cumulativeTime)
+
+        if moduleText[1:2] != " ":
+
+            if moduleText.strip() == entryModule:
+
+                moduleTimes = pendingTimes
+
+            pendingTimes = {}
+
+    return {"TotalMs": moduleTimes.get(entryModule, 0) / 1000, "Modules": moduleTimes}
+
+def parseArguments(argv: list | None = None):
+
+    parser = argparse.ArgumentParser(description="Check the cold import time of the UI against its budget.")
+    parser.add_argument("--runs", type=int, default=5, help="number of fresh interpreter runs, the median is compared")
+    parser.add_argument("--budget", type=float, default=STARTUP_BUDGET_MS, help="import time budget in milliseconds")
+    parser.add_argument("--top", type=int, default=15, help="number of slowest modules to list")
+    parser.add_argument("--module", default=ENTRY_MODULE, help="entry module to import")
+
+    return parser.parse_args(argv)
+
+def main(argv: list | None = None) -> int:
+
+    arguments = parseArguments(argv)
+    runList = [measureImportTime(arguments.module) for _ in range(max(1, arguments.runs))]
+    medianMs = statistics.median(run["TotalMs"] for run in runList)
+    moduleTimes = runList[-1]["Modules"]
+
+    print(f"{'Module':<50} {'Cumulative ms':>14}")
+
+    for moduleName, cumulativeTime in sorted(moduleTimes.items(), key=lambda item: item[1], reverse=True)[:arguments.top]:
+
+        print(f"{moduleName[:50]:<50} {cumulativeTime / 1000:>14.1f}")
+
+    print()
+    print(f"Import of {arguments.module}: median {medianMs:.1f} ms over {len(runList)} runs, budget {arguments.budget:.0f} ms.")
+    exitCode = 0
+
+    loadedDeferred = [moduleName for moduleName in DEFERRED_MODULES if moduleName in moduleTimes]
+
+    if len(loadedDeferred) > 0:
+
+        print(f"FAIL: modules meant to load on first use were imported at startup: {', '.join(loadedDeferred)}")
+        exitCode = 1
+
+    if medianMs > arguments.budget:
+
+        print(f"FAIL: startup import time exceeds the budget by {medianMs - arguments.budget:.1f} ms.")
+        exitCode = 1
+
+    return exitCode
+
+if __name__ == "__main__":
+
+    sys.exit(main())
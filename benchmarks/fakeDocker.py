@@ -0,0 +1,167 @@
+import docker
+import hashlib
+import json
+import random
+import tarfile
+
+SYNTHETIC_BLOCK_SIZE = 1024 * 1024
+
+def syntheticBlocks(size: int, compressibility: float, seed: str):
+
+    # Each block is random data followed by zeros, the zero share sets how well the stream compresses
+
+    generator = random.Random(seed)
+
+    while size > 0:
+
+        blockSize = min(SYNTHETIC_BLOCK_SIZE, size)
+        randomSize = int(blockSize * (1.0 - compressibility))
+        yield generator.randbytes(randomSize) + bytes(blockSize - randomSize)
+        size -= blockSize
+
+def tarMember(name: str, size: int, blocks):
+
+    tarInfo = tarfile.TarInfo(name)
+    tarInfo.size = size
+    tarInfo.mode = 0o644
+    yield tarInfo.tobuf(tarfile.GNU_FORMAT, "utf-8", "surrogateescape")
+    yield from blocks
+    yield bytes(-size % tarfile.BLOCKSIZE)
+
+def tarBytesMember(name: str, data: bytes):
+
+    yield from tarMember(name, len(data), [data])
+
+def saveArchive(imageList: list):
+
+    # Synthetic OCI layout save stream, layers shared between images are written once like docker does
+
+    writtenLayers = set()
+    manifestList = []
+
+    for image in imageList:
+
+        layerNameList = []
+
+        for layerDigest, layerSize, layerSeed in image.layers:
+
+            layerName = f"blobs/sha256/{layerDigest}"
+            layerNameList.append(layerName)
+
+            if layerDigest not in writtenLayers:
+
+                writtenLayers.add(layerDigest)
+                yield from tarMember(layerName, layerSize, syntheticBlocks(layerSize, image.compressibility, layerSeed))
+
+        manifestList.append({"Config": f"blobs/sha256/{image.id.split(':', 1)[1]}", "RepoTags": list(image.tags), "Layers": layerNameList})
+
+    yield from tarBytesMember("manifest.json", json.dumps(manifestList).encode("utf-8"))
+    yield bytes(tarfile.BLOCKSIZE * 2)
+
+class FakeImage:
+
+    def __init__(self, collection, name: str, size: int, compressibility: float, sharedSize: int = 0):
+
+        self.collection = collection
+        self.id = f"sha256:{hashlib.sha256(name.encode('utf-8')).hexdigest()}"
+        self.tags = [name]
+        self.compressibility = compressibility
+        self.layers = []
+
+        if sharedSize > 0:
+
+            self.layers.append((hashlib.sha256(b"shared-base").hexdigest(), sharedSize, "shared-base"))
+
+        self.layers.append((hashlib.sha256(f"{name}-layer".encode("utf-8")).hexdigest(), size, f"{name}-layer"))
+        self.attrs = {"Id": self.id, "RepoTags": self.tags, "Size": sum(layer[1] for layer in self.layers)}
+
+    def save(self, chunk_size=docker.constants.DEFAULT_DATA_CHUNK_SIZE, named=False):
+
+        return saveArchive([self])
+
+    def tag(self, repository: str, tag: str | None = None, **kwargs) -> bool:
+
+        self.collection.tagImage(self, f"{repository}:{tag or 'latest'}")
+        return True
+
+class FakeImageCollection:
+
+    def __init__(self):
+
+        self.imageMap = {}
+
+    def create(self, name: str, size: int, compressibility: float, sharedSize: int = 0) -> FakeImage:
+
+        image = FakeImage(self, name, size, compressibility, sharedSize)
+        self.tagImage(image, name)
+        self.imageMap[image.id] = image
+
+        return image
+
+    def tagImage(self, image: FakeImage, name: str):
+
+        if name not in image.tags:
+
+            image.tags.append(name)
+
+        self.imageMap[name] = image
+
+    def get(self, name: str) -> FakeImage:
+
+        if name not in self.imageMap:
+
+            raise docker.errors.ImageNotFound(f"No such image: {name}")
+
+        return self.imageMap[name]
+
+    def list(self, name: str | None = None, all: bool = False, filters: dict | None = None) -> list:
+
+        return list({id(image): image for image in self.imageMap.values()}.values())
+
+    def remove(self, image: str, force: bool = False, noprune: bool = False):
+
+        removedImage = self.get(image)
+        self.imageMap.pop(image, None)
+
+        if image in removedImage.tags:
+
+            removedImage.tags.remove(image)
+
+class FakeAPIClient:
+
+    def __init__(self, images: FakeImageCollection):
+
+        self.images = images
+
+    # The multi-image save endpoint is reached through the same private helpers BuildUp uses
+
+    def _url(self, path: str) -> str:
+
+        return path
+
+    def _get(self, url: str, params: dict | None = None, stream: bool = False):
+
+        return [self.images.get(name) for name in params.get("names", [])]
+
+    def _raise_for_status(self, response):
+
+        pass
+
+    def _stream_raw_result(self, response, chunk_size: int, decode: bool):
+
+        return saveArchive(response)
+
+class FakeDockerClient:
+
+    def __init__(self):
+
+        self.images = FakeImageCollection()
+        self.api = FakeAPIClient(self.images)
+
+    def ping(self) -> bool:
+
+        return True
+
+    def close(self):
+
+        pass
@@ -1,4 +1,21 @@
-from .build import *
-from .test import *
+from .config import ConfigStore, configStore
 
-__all__ = ["TestUp", "BuildUp"]
\ No newline at end of file
+def __getattr__(name):
+
+    # BuildUp and TestUp pull in the Docker SDK, so they are only imported on first use
+
+    if name == "BuildUp":
+
+        from .build import BuildUp
+        globals()["BuildUp"] = BuildUp
+        return BuildUp
+
+    if name == "TestUp":
+
+        from .test import TestUp
+        globals()["TestUp"] = TestUp
+        return TestUp
+
+    raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
+
+__all__ = ["TestUp", "BuildUp", "ConfigStore", "configStore"]
\ No newline at end of file
@@ -1,36 +1,64 @@
+import copy
 import docker
+import hashlib
+import io
+import json
 import maplex
 import os
+import re
 import shutil
+import tarfile
 import threading
 
-import ttkbootstrap as ttk
-from ttkbootstrap.constants import *
-from ttkbootstrap.dialogs import Messagebox
+from concurrent.futures import FIRST_COMPLETED, ThreadPoolExecutor, wait
+from typing import TYPE_CHECKING
 
 from statics import *
-from ui.dialog import ProgressWindow
-
-import PIL._tkinter_finder
+from .cache import BuildCache, FileHashCache
+from .client import getDockerClient
+from .config import configStore, thaw
+from .context import ContextCache
+from .graph import DependencyCycleError, ImageGraph
+from .journal import PHASE_BUILT, PHASE_CONFIG_UPDATED, PHASE_PACKAGED, PHASE_RUN, PhaseJournal
+from .compress import COMPRESSION_AUTO, COMPRESSION_EXTENSIONS, COMPRESSION_GZIP, COMPRESSION_NONE, detectCompression, normalizeCompression, peekStream
+from .layers import LayerStore, isLayerMember
+from .metrics import PipelineMetrics
+from .notify import showError
+from .package import STREAM_BUFFER_SIZE, ChunkReader, PackageWriter
+from .progress import ProgressBus
+from .snapshot import VolumeIndex
+from .steps import BuildStepRecorder
+
+if TYPE_CHECKING:
+
+    import ttkbootstrap as ttk
 
 class BuildUp:
 
-    def __init__(self, buildOptions: dict, root: ttk.Frame):
+    def __init__(self, buildOptions: dict, root: "ttk.Frame | None", client: docker.DockerClient | None = None):
 
         # Logging setup
         self.logger = maplex.Logger(__name__)
         self.logger.info("Initializing BuildUp App.")
 
-        self.configFile = maplex.MapleJson("config.json")
+        self.configFile = configStore
         self.config = self.configFile.read(KEY_OP_APPLICATION)
         self.confImageList = self.config.get(KEY_OP_IMAGES, [])
+        self.buildSettings = self.config.get(KEY_OP_BUILD, {})
         self.updatedImageList = []
 
+        # Every pipeline phase is timed per image and appended next to the maplex logs
+
+        logDirectory = self.configFile.read(KEY_OP_LOGGER).get(KEY_LOG_DIRECTORY, "logs")
+        self.metricsPath = os.path.join(logDirectory, "metrics.jsonl")
+        self.metrics = PipelineMetrics()
+
         self.loadOptions(buildOptions)
         self.root = root
-        self.client = docker.from_env()
+        self.client = client if client is not None else getDockerClient(self.buildSettings.get(KEY_CLIENT_POOL_SIZE), True)
         self.builtImageList = []
-        self.packagePath = self.config.get(KEY_OP_PACKAGE, {}).get(KEY_OUTPUT_DIRECTORY, "./packages")
+        self.packageSettings = self.config.get(KEY_OP_PACKAGE, {})
+        self.packagePath = self.packageSettings.get(KEY_OUTPUT_DIRECTORY, "./packages")
 
         if not os.path.exists(self.packagePath):
 
@@ -38,6 +66,61 @@ class BuildUp:
             os.makedirs(self.packagePath)
             self.changeOwnership(self.packagePath)
 
+        useBuildCache = self.buildSettings.get(KEY_BUILD_CACHE, False)
+        useContextCache = self.buildSettings.get(KEY_CONTEXT_CACHE, False)
+
+        if useBuildCache or useContextCache:
+
+            self.fileHashCache = FileHashCache(os.path.join(self.packagePath, ".file_hashes.json"))
+
+        else:
+
+            self.fileHashCache = None
+
+        if useBuildCache:
+
+            self.buildCache = BuildCache(os.path.join(self.packagePath, ".build_cache.json"), self.fileHashCache)
+
+        else:
+
+            self.buildCache = None
+
+        if useContextCache:
+
+            self.contextCache = ContextCache(os.path.join(self.packagePath, ".context"), self.fileHashCache)
+
+        else:
+
+            self.contextCache = None
+
+        self.pendingCacheEntries = {}
+
+        if self.packageSettings.get(KEY_DELTA_RELEASE, False):
+
+            self.layerStore = LayerStore(os.path.join(self.packagePath, ".layers"))
+
+        else:
+
+            self.layerStore = None
+
+        self.pendingLayerReleases = {}
+        self.pendingVolumeIndexes = {}
+        self.failureList = []
+        self.failureLock = threading.Lock()
+        self.failedImageSet = set()
+
+        # Completed phases are journaled so an interrupted run can be resumed
+
+        self.journal = PhaseJournal(os.path.join(self.packagePath, ".build_journal.jsonl"))
+        self.resumedPackageSet = set()
+        self.imageGraph = None
+        self.packageEstimates = {}
+
+        # Workers report progress through the bus, the window and any headless consumer subscribe to it
+
+        self.progressBus = ProgressBus()
+        self.progressBus.subscribe(self.logProgress)
+
         self.logger.info("BuildUp App initialized successfully.")
 
     def loadOptions(self, buildOptions: dict):
@@ -46,13 +129,21 @@ class BuildUp:
         self.commonOptions = buildOptions.get(KEY_OP_COMMON, {})
         self.buildAll = self.commonOptions.get(KEY_COM_BUILD_ALL, False)
         self.imageOptions = buildOptions.get(KEY_OP_IMAGES, {})
-        self.logger.debug(f"Options loaded: buildAll={self.buildAll}, imageOptions={self.imageOptions}")
+        self.resume = self.commonOptions.get(KEY_COM_RESUME, False)
+        self.logger.debug(f"Options loaded: buildAll={self.buildAll}, resume={self.resume}, imageOptions={self.imageOptions}")
+
+    def startBuild(self, resume: bool | None = None):
+
+        if resume is not None:
 
-    def startBuild(self):
+            self.resume = resume
+
+        # The dialogs are only needed when building from the UI
+
+        from ui.dialog import ProgressWindow, SummaryWindow
 
         self.logger.info("Starting build process.")
-        steps = len(self.confImageList) * 6 + [1, 2][self.buildAll]
-        self.progressWindow = ProgressWindow("Building Images", steps)
+        self.progressWindow = ProgressWindow("Building Images", self.getStepCount(), self.progressBus)
 
         thread = threading.Thread(target=self.processBuild)
         thread.start()
@@ -60,27 +151,242 @@ class BuildUp:
 
         #thread.join()
 
-        Messagebox.show_info("Build process completed successfully!", "Build Complete", parent=self.root)
-        self.logger.info("Build process completed successfully.")
+        # Workers only collect failures, they are shown here on the Tk thread once the progress grab is gone
+
+        if len(self.failureList) > 0:
+
+            showError(self.root, "\n".join(self.failureList), "Build Errors")
+            summaryMessage = f"Build process finished with {len(self.failureList)} errors."
+
+        else:
+
+            summaryMessage = "Build process completed successfully!"
+
+        summaryWindow = SummaryWindow("Build Complete", summaryMessage, ["Target", "Phase", "Seconds", "MB", "MB/s", "Status"], self.metrics.summaryRows())
+        summaryWindow.master.wait_window(summaryWindow)
+        self.logger.info(summaryMessage)
+
+    def getStepCount(self) -> int:
+
+        return len(self.confImageList) * 6 + [1, 2][self.buildAll]
+
+    def reportError(self, message: str, title: str):
+
+        # Called from worker threads, so failures are only collected and published, never shown here
+
+        with self.failureLock:
+            self.failureList.append(message)
+
+        self.logger.error(f"{title}: {message}")
+        self.progressBus.publish(f"{title}: {message}", 0)
 
     def processBuild(self):
 
-        for imageConfig in self.confImageList:
+        try:
+
+            self.prepareJournal()
+            maxParallelBuilds = max(1, int(self.buildSettings.get(KEY_MAX_PARALLEL_BUILDS, 1)))
+            imageGraph = ImageGraph(self.confImageList)
+            self.imageGraph = imageGraph
+            self.logger.info(f"Building {len(self.confImageList)} images with up to {maxParallelBuilds} parallel builds in dependency levels: {imageGraph.levels()}")
+            resultMap = self.scheduleBuilds(imageGraph, maxParallelBuilds)
+
+            # Collect results in configuration order so packaging and config updates stay deterministic
+
+            for imageConfig in self.confImageList:
+
+                self.builtImageList.extend(resultMap[imageConfig.get(KEY_NAME, "Unnamed Image")])
+                self.updateImageConfig(imageConfig)
+
+            self.checkDiskSpace()
+            self.packageImages()
+            self.updateConfig()
+
+            if self.buildAll:
+
+                self.logger.info("Build All option selected. Packaging all images.")
+
+                try:
+
+                    self.packageAllImages()
+
+                except Exception as e:
+
+                    self.logger.ShowError(e, "Failed to package all images")
+                    self.reportError(f"Failed to package all images: {e}", "Packaging Error")
+
+            if self.layerStore is not None:
+
+                self.pruneLayerStore()
+
+            if self.buildCache is not None:
+
+                self.buildCache.save()
+
+            if self.fileHashCache is not None:
+
+                self.fileHashCache.save()
+
+            # A finished run leaves nothing to resume
+
+            if len(self.failureList) == 0:
+
+                self.journal.clear()
+
+            self.progressBus.publish("Build process completed.", 0.5)
+
+        except DependencyCycleError as e:
+
+            self.logger.error(f"Build order could not be resolved: {e}")
+            self.reportError(f"Build order could not be resolved: {e}", "Dependency Error")
+
+        except Exception as e:
+
+            self.logger.ShowError(e, "Build process failed")
+            self.reportError(f"Build process failed: {e}", "Build Error")
+
+        finally:
+
+            self.writeMetrics()
+            self.progressBus.close()
+
+    def prepareJournal(self):
+
+        # A run is only resumed from a journal written for the same options
+
+        journalOptions = {KEY_OP_IMAGES: self.imageOptions, KEY_COM_BUILD_ALL: self.buildAll}
+        optionsDigest = hashlib.sha256(json.dumps(journalOptions, sort_keys=True, default=str).encode("utf-8")).hexdigest()
+        runEntry = self.journal.get(PHASE_RUN, "options")
+
+        if self.resume and runEntry is not None and runEntry.get("Digest") == optionsDigest:
+
+            self.logger.info("Resuming the interrupted build from its journal.")
+            return
+
+        if self.resume:
+
+            self.logger.warn("No journal was written for these build options. Starting from the beginning.")
+            self.resume = False
+
+        self.journal.clear()
+        self.journal.record(PHASE_RUN, "options", Digest=optionsDigest)
+
+    def resolveFromImages(self, imageName: str) -> list:
+
+        # Parents are built before their children, so each FROM resolves to the image this run will build on
+
+        parentImageIdList = []
+        fromImageList = self.imageGraph.fromMap.get(imageName, []) if self.imageGraph is not None else []
+
+        for fromImage in fromImageList:
+
+            try:
+
+                parentImageIdList.append(self.client.images.get(fromImage).id)
+
+            except docker.errors.APIError:
+
+                parentImageIdList.append(fromImage)
+
+        return parentImageIdList
+
+    def getJournaledImage(self, fullImageName: str):
+
+        entry = self.journal.get(PHASE_BUILT, fullImageName)
+
+        if entry is None:
+
+            return None
+
+        try:
+
+            return self.client.images.get(entry["ImageId"])
+
+        except docker.errors.ImageNotFound:
+
+            self.logger.debug(f"Journaled image {entry['ImageId']} for {fullImageName} no longer exists.")
+            return None
+
+    def scheduleBuilds(self, imageGraph: ImageGraph, maxParallelBuilds: int) -> dict:
+
+        # Each image is submitted as soon as all of its parents have finished, independent images build concurrently
+
+        imageConfigMap = {imageConfig.get(KEY_NAME, "Unnamed Image"): imageConfig for imageConfig in self.confImageList}
+        pendingCountMap = {imageName: len(parentSet) for imageName, parentSet in imageGraph.parentMap.items()}
+        resultMap = {}
+        futureMap = {}
+
+        with ThreadPoolExecutor(max_workers=maxParallelBuilds, thread_name_prefix="BuildWorker") as executor:
+
+            for imageName in imageGraph.imageNameList:
+
+                if pendingCountMap[imageName] == 0:
+
+                    futureMap[executor.submit(self.buildImage, imageConfigMap[imageName])] = imageName
+
+            while len(futureMap) > 0:
 
-            self.buildImage(imageConfig)
-            self.updateImageConfig(imageConfig)
+                doneSet, pendingSet = wait(futureMap, return_when=FIRST_COMPLETED)
+                finishedList = []
 
-        self.saveImages()
-        self.packageImages()
-        self.updateConfig()
+                for future in doneSet:
 
-        if self.buildAll:
+                    imageName = futureMap.pop(future)
+                    resultMap[imageName] = future.result()
+                    finishedList.append(imageName)
 
-            self.logger.info("Build All option selected. Packaging all images.")
-            self.packageAllImages()
+                while len(finishedList) > 0:
 
-        self.progressWindow.IncrementProgress("Build process completed.", 0.5)
-        self.progressWindow.closeWindow()
+                    imageName = finishedList.pop(0)
+
+                    for childName in imageGraph.imageNameList:
+
+                        if childName not in imageGraph.childMap[imageName]:
+
+                            continue
+
+                        pendingCountMap[childName] -= 1
+
+                        if pendingCountMap[childName] > 0:
+
+                            continue
+
+                        failedParentList = sorted(imageGraph.parentMap[childName] & self.failedImageSet)
+
+                        if len(failedParentList) > 0:
+
+                            # Dependents of a failed image are skipped rather than built on a stale parent
+
+                            self.failedImageSet.add(childName)
+                            self.reportError(f"Image {childName} was not built because its parent image {', '.join(failedParentList)} failed.", "Build Error")
+                            resultMap[childName] = []
+                            self.progressBus.publish(stepCount=4)
+                            finishedList.append(childName)
+
+                        else:
+
+                            self.logger.debug(f"Parents of image {childName} finished. Submitting its build.")
+                            futureMap[executor.submit(self.buildImage, imageConfigMap[childName])] = childName
+
+        return resultMap
+
+    def writeMetrics(self):
+
+        self.logger.info(f"Pipeline phase summary:\n{self.metrics.summary()}")
+
+        try:
+
+            self.metrics.write(self.metricsPath)
+
+        except Exception as e:
+
+            self.logger.ShowError(e, f"Failed to write pipeline metrics to {self.metricsPath}")
+
+    def logProgress(self, stepMessage: str | None, stepCount: float):
+
+        if stepMessage is not None:
+
+            self.logger.debug(f"Progress: {stepMessage}")
 
     def buildImage(self, imageConfig: dict):
 
@@ -90,6 +396,7 @@ class BuildUp:
         packageVolumes = imageOptions.get(KEY_PACK_VOLUMES, False)
         packageVolumeList = imageConfig.get(KEY_VOLUMES, []) if packageVolumes else []
         packageVersion = imageOptions.get(KEY_VERSION, "latest")
+        packageSetList = []
         self.logger.debug(f"Processing image: {imageName}")
 
         if imageOptions.get(KEY_DELETE, False):
@@ -103,7 +410,7 @@ class BuildUp:
             except Exception as e:
 
                 self.logger.ShowError(e, f"Failed to delete old packages for image {imageName}")
-                Messagebox.show_error(f"Failed to delete old packages for image {imageName}: {e}", "Delete Error", parent=self.root)
+                self.reportError(f"Failed to delete old packages for image {imageName}: {e}", "Delete Error")
 
         if self.buildAll or imageOptions.get(KEY_BUILD, False):
 
@@ -111,98 +418,446 @@ class BuildUp:
 
                 self.logger.info(f"Building image: {imageName}")
                 contextPath = imageConfig.get(KEY_CONTEXT_PATH, ".")
+                dockerfile = imageConfig.get(KEY_DOCKERFILE, "Dockerfile")
+
+                # The same Dockerfile and build arguments feed the cache key, FROM resolution and the daemon
+
+                buildArgs = thaw(imageConfig.get(KEY_BUILD_ARGS, {}))
+                tagReleaseBuild = self.buildSettings.get(KEY_TAG_RELEASE_BUILD, False)
+                builtImage = None
+                cacheKey = None
+                contextFileList = None
+                contextArchive = None
+
+                # The .dockerignore-filtered file list feeds both the cache key and the context archive
+
+                if self.contextCache is not None:
+
+                    if self.contextCache.isInsideContext(contextPath, dockerfile):
+
+                        contextFileList = self.contextCache.listFiles(contextPath, dockerfile)
+
+                    else:
+
+                        self.logger.info(f"Dockerfile {dockerfile} of image {imageName} is outside its context. Context caching is skipped.")
+
+                # Volume contents are not part of the cache key, so images packed with volumes are always rebuilt
+
+                if self.buildCache is not None and not packageVolumes:
+
+                    cacheKey = self.buildCache.computeKey(contextPath, dockerfile, buildArgs, contextFileList, self.resolveFromImages(imageName))
+                    self.logger.debug(f"Build cache key for image {imageName}: {cacheKey}")
 
                 def buildAndSave(latest=True):
 
-                    # Build the image
+                    nonlocal builtImage, contextArchive
+
+                    # Build the image, or tag the image already built in this run
 
                     tagVersion = "latest" if latest else packageVersion
                     fullImageName = f"{baseImage}:{tagVersion}"
-                    self.progressWindow.IncrementProgress(f"Processing image: {fullImageName}", 1)
+                    packagePath = os.path.join(self.packagePath, f"{baseImage}_{tagVersion}")
+                    self.progressBus.publish(f"Processing image: {fullImageName}", 1)
+                    cachedImage = self.getCachedImage(fullImageName, cacheKey, packagePath) if cacheKey is not None else None
+
+                    if cachedImage is not None:
+
+                        builtImage = cachedImage
+                        builtImage.tag(baseImage, tag=tagVersion)
+                        self.logger.info(f"Image {fullImageName} is unchanged since the last build. Skipping build and packaging.")
+                        packageSetList.append([imageName, packagePath, None, packageVolumes, packageVolumeList])
+                        self.progressBus.publish(stepCount=1)
+                        return
+
+                    if self.resume and self.isPackageJournaled(packagePath):
+
+                        # The interrupted run already wrote this package, its image may be gone by now
+
+                        journaledImage = self.getJournaledImage(fullImageName)
+
+                        if journaledImage is not None:
+
+                            builtImage = journaledImage
+
+                            if cacheKey is not None:
+
+                                self.pendingCacheEntries[packagePath] = (fullImageName, cacheKey, builtImage.id)
+
+                        self.logger.info(f"Image {fullImageName} was packaged by the interrupted run. Skipping build and packaging.")
+                        self.resumedPackageSet.add(packagePath)
+                        packageSetList.append([imageName, packagePath, None, packageVolumes, packageVolumeList])
+                        self.progressBus.publish(stepCount=1)
+                        return
+
+                    journaledImage = self.getJournaledImage(fullImageName) if self.resume else None
+
+                    if journaledImage is not None:
+
+                        builtImage = journaledImage
+                        builtImage.tag(baseImage, tag=tagVersion)
+                        self.logger.info(f"Image {fullImageName} was built by the interrupted run. Skipping build.")
+
+                    elif tagReleaseBuild and builtImage is not None:
+
+                        with self.metrics.phase(fullImageName, "tag"):
+                            builtImage.tag(baseImage, tag=tagVersion)
+
+                        self.logger.info(f"Image {builtImage.id} tagged as {fullImageName} without rebuilding.")
+
+                    else:
+
+                        self.logger.debug(f"Building image with context: {contextPath}, tag: {fullImageName}")
+
+                        with self.metrics.phase(fullImageName, "build") as phaseRecord:
 
-                    self.logger.debug(f"Building image with context: {contextPath}, tag: {fullImageName}")
-                    self.client.images.build(path=contextPath, tag=fullImageName, rm=True)
-                    self.logger.info(f"Image {fullImageName} built successfully.")
+                            if contextFileList is not None:
+
+                                # Both builds of one image and unchanged contexts across runs reuse the same archive
+
+                                if contextArchive is None:
+
+                                    fingerprint = self.fileHashCache.fingerprint(os.path.abspath(contextPath), contextFileList)
+                                    contextArchive = self.contextCache.getArchive(contextPath, dockerfile, contextFileList, fingerprint)
+
+                                phaseRecord["Bytes"] = os.path.getsize(contextArchive)
+
+                                with open(contextArchive, "rb") as contextFile:
+                                    builtImage = self.streamBuild(fullImageName, fileobj=contextFile, custom_context=True, dockerfile=dockerfile, buildargs=buildArgs)
+
+                            else:
+
+                                builtImage = self.streamBuild(fullImageName, path=contextPath, dockerfile=dockerfile, buildargs=buildArgs)
+
+                        self.logger.info(f"Image {fullImageName} built successfully.")
+
+                    self.journal.record(PHASE_BUILT, fullImageName, ImageId=builtImage.id)
+
+                    if cacheKey is not None:
+
+                        self.pendingCacheEntries[packagePath] = (fullImageName, cacheKey, builtImage.id)
 
                     # Save the image to temporary list
 
-                    packagePath = os.path.join(self.packagePath, f"{baseImage}_{tagVersion}")
                     packageSet = [imageName, packagePath, fullImageName, packageVolumes, packageVolumeList]
-                    self.builtImageList.append(packageSet)
-                    self.progressWindow.IncrementProgress(stepCount=1)
+                    packageSetList.append(packageSet)
+                    self.progressBus.publish(stepCount=1)
 
-            except Exception as e:
+                buildAndSave()
 
-                self.logger.ShowError(e, f"Failed to build and save image {imageName}")
-                Messagebox.show_error(f"Failed to build and save image {imageName}: {e}", "Build Error", parent=self.root)
+                if imageOptions.get(KEY_RELEASE, False):
 
-            buildAndSave()
+                    self.logger.info(f"Release option selected for image: {imageName}.")
+                    buildAndSave(False)
 
-            if imageOptions.get(KEY_RELEASE, False):
+                else:
 
-                self.logger.info(f"Release option selected for image: {imageName}.")
-                buildAndSave(False)
+                    self.progressBus.publish(stepCount=2)
 
-            else:
+            except Exception as e:
 
-                self.progressWindow.IncrementProgress(stepCount=2)
+                self.logger.ShowError(e, f"Failed to build and save image {imageName}")
+                self.failedImageSet.add(imageName)
+                self.reportError(f"Failed to build and save image {imageName}: {e}", "Build Error")
 
         else:
 
             self.logger.info(f"Skipping build for image: {imageName} as it is not selected.")
             packagePath = os.path.join(self.packagePath, f"{baseImage}_latest")
-            self.builtImageList.append([imageName, packagePath, None, packageVolumes, packageVolumeList])  # Add placeholder for packaging step
+            packageSetList.append([imageName, packagePath, None, packageVolumes, packageVolumeList])  # Add placeholder for packaging step
 
             if imageOptions.get(KEY_RELEASE, False):
 
                 packagePath = os.path.join(self.packagePath, f"{baseImage}_{packageVersion}")
-                self.builtImageList.append([imageName, packagePath, None, packageVolumes, packageVolumeList])  # Add placeholder for packaging step
+                packageSetList.append([imageName, packagePath, None, packageVolumes, packageVolumeList])  # Add placeholder for packaging step
 
-            self.progressWindow.IncrementProgress(stepCount=4)
+            self.progressBus.publish(stepCount=4)
 
-    def saveImages(self):
+        return packageSetList
 
-        for packageSet in self.builtImageList:
+    def streamBuild(self, fullImageName: str, **buildOptions):
 
-            try:
+        # Consume the decoded build stream so every Dockerfile step reports progress as it starts
 
-                imageName, packagePath, imageName, _, _ = packageSet
+        stepRecorder = BuildStepRecorder()
+        buildLog = []
+        imageId = None
 
-                if packagePath.endswith("_latest"):
+        for chunk in self.client.api.build(tag=fullImageName, rm=True, decode=True, **buildOptions):
+
+            buildLog.append(chunk)
+
+            if "error" in chunk:
+
+                raise docker.errors.BuildError(chunk.get("errorDetail", {}).get("message", chunk["error"]), buildLog)
+
+            for line in chunk.get("stream", "").splitlines():
+
+                self.logger.trace(f"[{fullImageName}] {line}")
+                step = stepRecorder.feed(line)
+
+                if step is not None:
+
+                    self.progressBus.publish(f"Building {fullImageName}: step {step['Step']}/{step['Total']} {step['Instruction'][:60]}", 0)
+
+                successMatch = re.search(r"Successfully built ([0-9a-f]+)", line)
+
+                if successMatch is not None:
+
+                    imageId = successMatch.group(1)
+
+            if "ID" in chunk.get("aux", {}):
+
+                imageId = chunk["aux"]["ID"]
+
+        stepRecorder.finish()
+        self.metrics.recordBuildSteps(fullImageName, stepRecorder.steps)
+        self.logger.info(f"Build steps for {fullImageName}:\n{stepRecorder.summary()}")
+
+        if imageId is None:
+
+            raise docker.errors.BuildError(f"Build of {fullImageName} finished without an image ID.", buildLog)
+
+        return self.client.images.get(imageId)
+
+    def saveImage(self, packageWriter: PackageWriter, fullImageName: str, packagePath: str, saveChunks=None):
+
+        # The daemon exports each image once, its save stream is consumed while the package is written
+
+        self.logger.debug(f"Saving image {fullImageName} into package {packageWriter.archivePath}")
+
+        if saveChunks is None:
+
+            saveChunks = self.client.images.get(fullImageName).save(named=fullImageName)
+
+        if self.layerStore is not None and not packagePath.endswith("_latest"):
+
+            with self.metrics.phase(fullImageName, "save") as phaseRecord:
+                phaseRecord["Bytes"] = self.saveImageDelta(packageWriter, saveChunks, fullImageName, packagePath)
+
+        else:
+
+            with self.metrics.phase(fullImageName, "save") as phaseRecord:
+                savedSize = self.saveImageMembers(packageWriter, saveChunks, fullImageName)
+                phaseRecord["Bytes"] = savedSize
+
+            self.logger.info(f"Image {fullImageName} saved successfully into package under image/ ({savedSize} bytes).")
+
+        if not packagePath.endswith("_latest"):
+
+            self.logger.info("Deleting non-latest image as release option is selected.")
+            self.client.images.remove(image=fullImageName, force=True)
+            self.logger.debug(f"Image {fullImageName} removed successfully after saving.")
+
+    def saveImageMembers(self, packageWriter: PackageWriter, saveChunks, saveName: str) -> int:
+
+        # Each member of the save archive carries its own size, so it is copied under image/ in a single pass
+
+        saveStream = io.BufferedReader(ChunkReader(saveChunks), STREAM_BUFFER_SIZE)
+        savedSize = 0
 
-                    self.progressWindow.IncrementProgress(f"Saving image {imageName}...", 1)
+        with tarfile.open(fileobj=saveStream, mode="r|") as saveArchive:
 
-                # Get image object from Docker client
+            for member in saveArchive:
 
-                if imageName is not None:
+                packedInfo = copy.copy(member)
+                packedInfo.name = f"image/{member.name}"
 
-                    image = self.client.images.get(imageName)
+                if member.isfile():
+
+                    packageWriter.addMember(packedInfo, saveArchive.extractfile(member))
+                    savedSize += member.size
+
+                elif member.isdir() or member.issym():
+
+                    packageWriter.addMember(packedInfo)
 
                 else:
 
-                    image = None
+                    self.logger.warn(f"Unsupported member {member.name} in save archive of {saveName}. Skipping.")
 
-                if image is not None:
+        return savedSize
 
-                    tarPath = f"{packagePath}.tar"
-                    self.logger.debug(f"Saving image {imageName} to temporary tar file {tarPath}")
+    def saveImageDelta(self, packageWriter: PackageWriter, saveChunks, fullImageName: str, packagePath: str):
 
-                    with open(tarPath, 'wb') as f:
-                        for chunk in image.save(named=True):
-                            f.write(chunk)
+        # Release packages only carry the layers the previous release package lacked.
+        # delta.json lists every member of the save archive so a loader can put the full image back together.
 
-                    self.logger.info(f"Image {imageName} saved successfully at {tarPath}")
+        baseImage, version = fullImageName.rsplit(":", 1)
+        previousRelease = self.layerStore.previousRelease(baseImage, version)
+        previousLayers = set(previousRelease.get("Layers", [])) if previousRelease is not None else set()
+        self.logger.debug(f"Saving delta package for {fullImageName} against {len(previousLayers)} layers of the previous release.")
 
-                    if not packagePath.endswith("_latest"):
+        saveStream = io.BufferedReader(ChunkReader(saveChunks), STREAM_BUFFER_SIZE)
+        memberList = []
+        layerDigestList = []
+        includedSize = 0
+        omittedSize = 0
 
-                        self.logger.info("Deleting non-latest image as release option is selected.")
-                        self.client.images.remove(image=imageName, force=True)
-                        self.logger.debug(f"Image {imageName} removed successfully after saving.")
+        with tarfile.open(fileobj=saveStream, mode="r|") as saveArchive:
 
-            except Exception as e:
+            for member in saveArchive:
+
+                memberEntry = {"Name": member.name, "Mode": member.mode, "Mtime": member.mtime}
+                packedInfo = copy.copy(member)
+                packedInfo.name = f"image/{member.name}"
+
+                if member.isdir():
+
+                    memberEntry["Type"] = "dir"
+                    packageWriter.addMember(packedInfo)
+
+                elif member.issym():
+
+                    memberEntry["Type"] = "symlink"
+                    memberEntry["LinkName"] = member.linkname
+                    packageWriter.addMember(packedInfo)
+
+                elif member.isfile() and isLayerMember(member.name):
+
+                    layerDigest, layerSize = self.layerStore.put(saveArchive.extractfile(member))
+                    layerDigestList.append(layerDigest)
+                    memberEntry.update({"Type": "file", "Size": layerSize, "Digest": layerDigest, "Included": layerDigest not in previousLayers})
+
+                    if memberEntry["Included"]:
+
+                        with open(self.layerStore.blobPath(layerDigest), "rb") as layerFile:
+                            packageWriter.addMember(packedInfo, layerFile)
+
+                        includedSize += layerSize
+
+                    else:
+
+                        omittedSize += layerSize
+
+                elif member.isfile():
+
+                    memberEntry.update({"Type": "file", "Size": member.size, "Included": True})
+                    packageWriter.addMember(packedInfo, saveArchive.extractfile(member))
+
+                else:
+
+                    self.logger.warn(f"Unsupported member {member.name} in save archive of {fullImageName}. Skipping.")
+                    continue
+
+                memberList.append(memberEntry)
+
+        deltaManifest = {
+            "Image": fullImageName,
+            "BaseVersion": previousRelease.get("Version") if previousRelease is not None else None,
+            "Members": memberList
+        }
+        packageWriter.addBytes("delta.json", json.dumps(deltaManifest, indent=4).encode("utf-8"))
+        self.pendingLayerReleases[packagePath] = (baseImage, version, layerDigestList)
+        self.logger.info(f"Delta package for {fullImageName} includes {includedSize} bytes of layers and omits {omittedSize} bytes already in release {deltaManifest['BaseVersion']}.")
+
+        return includedSize + omittedSize
+
+    def pruneLayerStore(self):
+
+        # A release stays in the store only while its package is still in the output directory
+
+        def keepReleases(releases: list) -> list:
+
+            return [release for release in releases if "Image" not in release or self.findPackageArchive(os.path.join(self.packagePath, f"{release['Image']}_{release['Version']}")) is not None]
+
+        try:
+
+            self.layerStore.prune(keepReleases)
+
+        except Exception as e:
+
+            self.logger.ShowError(e, "Failed to prune the layer store")
+
+    def saveImagesCombined(self, fullImageNameList: list):
+
+        # One docker save stream for several tags exports every shared layer only once.
+        # docker-py only wraps the single image endpoint, so the multi-name endpoint is called the same way.
+
+        api = self.client.api
+        response = api._get(api._url("/images/get"), params={"names": fullImageNameList}, stream=True)
+        api._raise_for_status(response)
+
+        return api._stream_raw_result(response, docker.constants.DEFAULT_DATA_CHUNK_SIZE, False)
+
+    def packVolumes(self, packageWriter: PackageWriter, imageName: str, packageVolumeList: list, packagePath: str):
+
+        self.logger.info(f"Packing volumes for image: {imageName}")
+        self.progressBus.publish(f"Packing volumes for image {imageName}...", 0)
+        manifestLines = []
+        volumeIndex = None
+        fileFilter = None
+
+        # Latest packages overwrite one archive, so only versioned release packages can chain increments
+
+        if self.packageSettings.get(KEY_INCREMENTAL_VOLUMES, False) and not packagePath.endswith("_latest"):
+
+            volumeIndex = self.openVolumeIndex(imageName, packagePath)
+            fileFilter = volumeIndex.isChanged
+
+        for index, volume in enumerate(packageVolumeList):
+
+            if os.path.exists(volume):
+
+                self.progressBus.publish(f"Packing volume {volume} for image {imageName}...", 0)
+                volumeArcName = f"volume_{index}/{os.path.basename(os.path.normpath(volume))}"
+
+                with self.metrics.phase(f"{imageName}:{volume}", "volumes") as phaseRecord:
+                    volumeStats = packageWriter.addPath(volumeArcName, volume, fileFilter)
+                    phaseRecord["Bytes"] = volumeStats["Bytes"]
+
+                manifestLines.append(f"volume_{index}:{volume}\n")
+                self.logger.info(f"Volume {volume} packed as {volumeArcName} for image {imageName}: {volumeStats['Files']} files, {volumeStats['Bytes']} bytes, {volumeStats['Unchanged']} unchanged, {volumeStats['Skipped']} skipped.")
+
+                if volumeIndex is not None:
+
+                    for skippedPath in volumeStats["SkippedPaths"]:
+
+                        volumeIndex.forget(skippedPath)
+
+            else:
+
+                self.logger.warn(f"Volume {volume} for image {imageName} does not exist. Skipping.")
+
+        # The manifest is written once, after every volume has been streamed
 
-                self.logger.ShowError(e, f"Failed to save image {imageName}")
-                Messagebox.show_error(f"Failed to save image {imageName}: {e}", "Save Error", parent=self.root)
+        packageWriter.addBytes("manifest.txt", "".join(manifestLines).encode("utf-8"))
+
+        if volumeIndex is not None:
+
+            # Incremental packages list the files deleted since the last snapshot
+
+            tombstoneList = volumeIndex.deletedArcNames()
+            packageWriter.addBytes("tombstones.txt", "".join(f"{arcName}\n" for arcName in tombstoneList).encode("utf-8"))
+            self.pendingVolumeIndexes[packagePath] = volumeIndex
+            self.logger.info(f"Incremental volume snapshot for image {imageName} records {len(tombstoneList)} deleted files.")
+
+    def openVolumeIndex(self, imageName: str, packagePath: str) -> VolumeIndex:
+
+        baseImage = self.getImageConfig(imageName).get(KEY_BASE_IMAGE, "UnknownBase")
+        indexPath = self.getVolumeIndexPath(baseImage)
+        os.makedirs(os.path.dirname(indexPath), exist_ok=True)
+
+        return VolumeIndex(indexPath, self.packageSettings.get(KEY_VOLUME_HASH, False))
+
+    def getVolumeIndexPath(self, baseImage: str) -> str:
+
+        return os.path.join(self.packagePath, ".volume_index", f"{baseImage.replace('/', '_')}_release.sqlite")
+
+    def commitVolumeIndex(self, packagePath: str, written: bool = True):
+
+        volumeIndex = self.pendingVolumeIndexes.pop(packagePath, None)
+
+        if volumeIndex is not None:
+
+            try:
+
+                if written:
+
+                    volumeIndex.commit()
+
+            finally:
+
+                volumeIndex.close()
 
     def packageImages(self):
 
@@ -217,68 +872,227 @@ class BuildUp:
 
                 if packagePath.endswith("_latest"):
 
-                    self.progressWindow.IncrementProgress(f"Packaging image {imageName}...", 1)
+                    self.progressBus.publish(f"Packaging image {imageName}...", 2)
 
-                if image is None and not packageVolumes:
+                if packagePath in self.resumedPackageSet:
 
-                    self.logger.info(f"No new image to package for {imageName} and no volumes to pack. Skipping packaging.")
+                    self.logger.info(f"Package {packagePath} was completed by the interrupted run. Skipping packaging.")
+                    self.commitCacheEntry(packagePath)
                     continue
 
-                if not os.path.exists(packagePath):
+                if image is None and not packageVolumes:
 
-                    os.makedirs(packagePath)
+                    self.logger.info(f"No new image to package for {imageName} and no volumes to pack. Skipping packaging.")
+                    continue
 
-                shutil.move(f"{packagePath}.tar", packagePath)
-                self.logger.debug(f"Image tar moved to package path {packagePath} for image {imageName}.")
+                # The image save stream and the volume files are written straight into the archive
 
-                if packageVolumes:
+                self.checkStagingSpace(packagePath, self.packageEstimates.get(packagePath))
+                saveChunks = self.client.images.get(image).save(named=image) if image is not None else None
+                sample = None
 
-                    self.logger.info(f"Packing volumes for image: {imageName}")
-                    self.progressWindow.IncrementProgress(f"Packing volumes for image {imageName}...", 0)
-                    manufestPath = os.path.join(packagePath, "manifest.txt")
+                if saveChunks is not None and self.getCompression(imageName)[0] == COMPRESSION_AUTO:
 
-                    for index, volume in enumerate(packageVolumeList):
+                    sample, saveChunks = peekStream(saveChunks)
 
-                        if os.path.exists(volume):
+                compression, compressionLevel = self.resolveCompression(imageName, sample)
 
-                            volumePackagePath = os.path.join(packagePath, f"volume_{index}")
-                            
-                            if not os.path.exists(volumePackagePath):
+                with self.metrics.phase(os.path.basename(packagePath), "package") as phaseRecord:
 
-                                os.makedirs(volumePackagePath)
+                    with self.openPackageWriter(packagePath, compression, compressionLevel) as packageWriter:
 
-                            if os.path.isdir(volume):
+                        archivePath = packageWriter.archivePath
+                        self.progressBus.publish(f"Creating archive {archivePath}...", 0)
 
-                                baseDirName = os.path.basename(volume)
-                                shutil.copytree(volume, os.path.join(volumePackagePath, baseDirName))
+                        if image is not None:
 
-                            else:
+                            self.saveImage(packageWriter, image, packagePath, saveChunks)
 
-                                shutil.copy2(volume, volumePackagePath)
+                        if packageVolumes:
 
-                            with open(manufestPath, 'a') as manifestFile:
-                                manifestFile.write(f"volume_{index}:{volume}\n")
+                            self.packVolumes(packageWriter, imageName, packageVolumeList, packagePath)
 
-                            self.logger.debug(f"Volume {volume} copied to {volumePackagePath} for image {imageName}.")
+                    phaseRecord["Bytes"] = os.path.getsize(archivePath)
 
-                self.createArchive(packagePath)
-                self.logger.info(f"Image {imageName} packaged successfully at {packagePath}.tar.gz")
+                self.removeStalePackages(packagePath, archivePath)
+                self.changeOwnership(archivePath)
+                self.commitCacheEntry(packagePath)
+                self.commitLayerRelease(packagePath)
+                self.commitVolumeIndex(packagePath)
+                self.journalPackage(packagePath, packageWriter)
+                self.logger.info(f"Image {imageName} packaged successfully at {archivePath}")
 
             except Exception as e:
 
+                self.commitVolumeIndex(packagePath, False)
                 self.logger.ShowError(e, f"Failed to package image {imageName}")
-                Messagebox.show_error(f"Failed to package image {imageName}: {e}", "Packaging Error", parent=self.root)
+                self.reportError(f"Failed to package image {imageName}: {e}", "Packaging Error")
+
+    def getPathSize(self, path: str) -> int:
+
+        if os.path.isfile(path):
+
+            return os.path.getsize(path)
+
+        pathSize = 0
+
+        for directoryPath, _, fileNameList in os.walk(path):
+
+            for fileName in fileNameList:
+
+                filePath = os.path.join(directoryPath, fileName)
+
+                if os.path.isfile(filePath) and not os.path.islink(filePath):
+
+                    pathSize += os.path.getsize(filePath)
+
+        return pathSize
+
+    def estimatePackageSize(self, image: str | None, packageVolumes: bool, packageVolumeList: list) -> int:
+
+        # Uncompressed sizes are the upper bound of what a package writer stages on disk
+
+        estimate = 0
+
+        if image is not None:
+
+            try:
+
+                estimate += self.client.images.get(image).attrs.get("Size", 0)
+
+            except docker.errors.ImageNotFound:
+
+                self.logger.debug(f"Image {image} not found while estimating its package size.")
+
+        if packageVolumes:
+
+            for volume in packageVolumeList:
+
+                if os.path.exists(volume):
+
+                    estimate += self.getPathSize(volume)
+
+        return estimate
+
+    def checkDiskSpace(self):
+
+        # Preflight before packaging starts, packages are written one at a time so each one is gated again
+
+        self.packageEstimates = {}
+
+        for imageName, packagePath, image, packageVolumes, packageVolumeList in self.builtImageList:
+
+            if packagePath in self.resumedPackageSet or (image is None and not packageVolumes):
+
+                continue
+
+            self.packageEstimates[packagePath] = self.estimatePackageSize(image, packageVolumes, packageVolumeList)
+            self.logger.debug(f"Package {packagePath} of image {imageName} is estimated at {self.packageEstimates[packagePath]} bytes.")
+
+        totalEstimate = sum(self.packageEstimates.values())
+        freeBytes = shutil.disk_usage(self.packagePath).free
+        self.logger.info(f"Packaging {len(self.packageEstimates)} packages estimated at {totalEstimate} bytes uncompressed, {freeBytes} bytes free in {self.packagePath}.")
+
+        if totalEstimate > freeBytes:
+
+            self.logger.warn(f"The packages may not all fit into {self.packagePath}. Packages that do not fit will be skipped.")
+            self.progressBus.publish(f"Warning: packages need up to {totalEstimate // 1048576} MB, only {freeBytes // 1048576} MB free.", 0)
+
+    def checkStagingSpace(self, packagePath: str, estimate: int | None):
+
+        # A package is only started when its uncompressed size fits the free space and the staging budget
+
+        if estimate is None:
+
+            return
+
+        freeBytes = shutil.disk_usage(self.packagePath).free
+        stagingBudget = int(self.packageSettings.get(KEY_STAGING_BUDGET, 0) or 0)
+        stagingLimit = min(freeBytes, stagingBudget) if stagingBudget > 0 else freeBytes
+
+        if estimate > stagingLimit:
+
+            raise IOError(f"Package {packagePath} needs up to {estimate} bytes but only {stagingLimit} bytes may be staged ({freeBytes} bytes free, budget {stagingBudget or 'unlimited'}).")
+
+        self.logger.debug(f"Package {packagePath} fits: {estimate} of {stagingLimit} bytes.")
+
+    def isPackageJournaled(self, packagePath: str) -> bool:
+
+        archivePath = self.findPackageArchive(packagePath)
+
+        return archivePath is not None and self.journal.isPackageValid(packagePath, archivePath)
+
+    def journalPackage(self, packagePath: str, packageWriter: PackageWriter):
+
+        self.journal.record(PHASE_PACKAGED, packagePath, Archive=packageWriter.archivePath, Size=packageWriter.size, Sha256=packageWriter.sha256)
+
+    def getCachedImage(self, fullImageName: str, cacheKey: str, packagePath: str):
+
+        entry = self.buildCache.lookup(fullImageName, cacheKey)
+
+        if entry is None:
+
+            return None
+
+        if self.findPackageArchive(packagePath) is None:
+
+            self.logger.debug(f"Cached package {packagePath} for {fullImageName} no longer exists.")
+            return None
+
+        try:
+
+            return self.client.images.get(entry["ImageId"])
+
+        except docker.errors.ImageNotFound:
+
+            self.logger.debug(f"Cached image {entry['ImageId']} for {fullImageName} no longer exists.")
+            return None
+
+    def commitCacheEntry(self, packagePath: str):
+
+        # Cache entries are recorded only once their package has been written
+
+        pendingEntry = self.pendingCacheEntries.pop(packagePath, None)
+
+        if pendingEntry is not None:
+
+            fullImageName, cacheKey, imageId = pendingEntry
+            self.buildCache.store(fullImageName, cacheKey, imageId, packagePath)
+
+    def commitLayerRelease(self, packagePath: str):
+
+        # Releases are recorded as a delta base only once their package has been written
+
+        pendingRelease = self.pendingLayerReleases.pop(packagePath, None)
+
+        if pendingRelease is not None:
+
+            baseImage, version, layerDigestList = pendingRelease
+            self.layerStore.recordRelease(baseImage, version, layerDigestList)
 
     def deleteOldPackages(self, baseImage: str):
 
         for file in os.listdir(self.packagePath):
 
-            if file.startswith(f"{baseImage}_") and file.endswith(".tar.gz"):
+            if file.startswith(f"{baseImage}_") and file.endswith(tuple(COMPRESSION_EXTENSIONS.values())):
 
                 filePath = os.path.join(self.packagePath, file)
                 os.remove(filePath)
                 self.logger.debug(f"Old package {filePath} deleted for image {baseImage}.")
 
+        if self.layerStore is not None:
+
+            self.layerStore.forgetImage(baseImage)
+
+        # The next release must be a full snapshot once the packages its increments build on are gone
+
+        indexPath = self.getVolumeIndexPath(baseImage)
+
+        if os.path.exists(indexPath):
+
+            os.remove(indexPath)
+            self.logger.debug(f"Volume index {indexPath} reset for image {baseImage}.")
+
     def changeOwnership(self, filePath: str):
 
         ownershipConfig = self.config.get(KEY_OP_PACKAGE, {}).get(KEY_OP_OWNERSHIP, {})
@@ -287,25 +1101,109 @@ class BuildUp:
 
         if user is not None and group is not None:
 
-            shutil.chown(filePath, user=user, group=group)
+            with self.metrics.phase(os.path.basename(filePath), "ownership"):
+                shutil.chown(filePath, user=user, group=group)
+
             self.logger.debug(f"Ownership of {filePath} changed to user: {user}, group: {group}.")
 
         else:
 
             self.logger.warn(f"Ownership information not fully specified in configuration. Skipping ownership change for {filePath}.")
 
-    def createArchive(self, directory: str):
+    def getImageConfig(self, imageName: str | None) -> dict:
+
+        return next((image for image in self.confImageList if image.get(KEY_NAME) == imageName), {})
+
+    def getCompression(self, imageName: str | None = None) -> tuple[str, int | None]:
+
+        # Per-image settings override the package defaults
+
+        imageConfig = self.getImageConfig(imageName)
+        compression = imageConfig.get(KEY_COMPRESSION, self.packageSettings.get(KEY_COMPRESSION, COMPRESSION_GZIP))
+        compressionLevel = imageConfig.get(KEY_COMPRESSION_LEVEL, self.packageSettings.get(KEY_COMPRESSION_LEVEL, None))
+
+        return normalizeCompression(compression), compressionLevel
+
+    def resolveCompression(self, imageName: str | None = None, sample: bytes | None = None) -> tuple[str, int | None]:
+
+        # Automatic compression judges the head of the save stream that is about to be packaged
+
+        compression, compressionLevel = self.getCompression(imageName)
+
+        if compression == COMPRESSION_AUTO:
+
+            if sample is not None:
+
+                compression = detectCompression(sample)
+
+            else:
+
+                compression = COMPRESSION_GZIP
+
+            self.logger.info(f"Automatic compression selected {compression} for {imageName or 'the package'}.")
+
+        return compression, compressionLevel
+
+    def openPackageWriter(self, packagePath: str, compression: str, compressionLevel: int | None = None) -> PackageWriter:
+
+        archivePath = f"{packagePath}{COMPRESSION_EXTENSIONS[compression]}"
+        compressionThreads = int(self.packageSettings.get(KEY_COMPRESSION_THREADS, 0)) or None
+        return PackageWriter(archivePath, compression, compressionLevel, compressionThreads)
+
+    def findPackageArchive(self, packagePath: str) -> str | None:
+
+        for extension in COMPRESSION_EXTENSIONS.values():
+
+            if os.path.exists(f"{packagePath}{extension}"):
+
+                return f"{packagePath}{extension}"
+
+        return None
+
+    def removeStalePackages(self, packagePath: str, archivePath: str):
+
+        # A package written with a different codec earlier would otherwise shadow the new one
+
+        for extension in COMPRESSION_EXTENSIONS.values():
 
-        self.logger.debug(f"Creating archive for directory {directory}.")
-        self.progressWindow.IncrementProgress(f"Creating archive for {directory}...", 0)
-        archivePath = f"{directory}.tar.gz"
-        shutil.make_archive(directory, 'gztar', directory)
-        shutil.rmtree(directory)
+            stalePath = f"{packagePath}{extension}"
+
+            if stalePath != archivePath and os.path.exists(stalePath):
+
+                os.remove(stalePath)
+                self.logger.debug(f"Stale package {stalePath} removed.")
+
+    def createArchive(self, archiveBasePath: str, sourcePathList: list, compression: str | None = None, compressionLevel: int | None = None) -> str:
+
+        self.logger.debug(f"Creating archive {archiveBasePath} from {len(sourcePathList)} paths.")
+        self.progressBus.publish(f"Creating archive for {archiveBasePath}...", 0)
+
+        if compression is None:
+
+            compression, compressionLevel = self.resolveCompression()
+
+        # Source paths are streamed into the archive in place, nothing is staged
+
+        with self.metrics.phase(os.path.basename(archiveBasePath), "archive") as phaseRecord:
+
+            with self.openPackageWriter(archiveBasePath, compression, compressionLevel) as packageWriter:
+
+                archivePath = packageWriter.archivePath
+
+                for sourcePath in sourcePathList:
+
+                    phaseRecord["Bytes"] += packageWriter.addPath(os.path.basename(sourcePath), sourcePath)["Bytes"]
+
+        self.removeStalePackages(archiveBasePath, archivePath)
         self.changeOwnership(archivePath)
-        self.logger.info(f"Directory {directory} archived successfully at {archivePath}.")
+        self.journalPackage(archiveBasePath, packageWriter)
+        self.logger.info(f"Archive {archivePath} created successfully.")
+
+        return archivePath
 
     def updateImageConfig(self, imageConfig: dict):
 
+        imageConfig = thaw(imageConfig)
         imageName = imageConfig.get(KEY_NAME, "Unnamed Image")
         imageOptions = self.imageOptions.get(imageName, {})
         self.logger.info(f"Updating config for image: {imageName}")
@@ -325,39 +1223,101 @@ class BuildUp:
     def updateConfig(self):
 
         self.logger.debug("Updating configuration file with new image versions.")
-        self.progressWindow.IncrementProgress("Updating configuration file...", 0.5)
+        self.progressBus.publish("Updating configuration file...", 0.5)
+
+        if self.resume and self.journal.get(PHASE_CONFIG_UPDATED, "config.json") is not None:
+
+            self.logger.info("Configuration was updated by the interrupted run. Skipping update.")
+            return
 
         try:
 
             self.logger.info("Updating configuration file with new image versions.")
-            configData = self.configFile.read()
-            configData[KEY_OP_APPLICATION][KEY_OP_IMAGES] = self.updatedImageList
-            self.configFile.write(configData)
+
+            with self.metrics.phase("config.json", "updateConfig"):
+                configData = self.configFile.readMutable()
+                configData[KEY_OP_APPLICATION][KEY_OP_IMAGES] = self.updatedImageList
+                self.configFile.write(configData)
+
+            self.journal.record(PHASE_CONFIG_UPDATED, "config.json")
             self.logger.info("Configuration file updated successfully.")
 
         except Exception as e:
 
             self.logger.ShowError(e, "Failed to update configuration file with new image versions")
-            Messagebox.show_error(f"Failed to update configuration file: {e}", "Configuration Update Error", parent=self.root)
+            self.reportError(f"Failed to update configuration file: {e}", "Configuration Update Error")
 
     def packageAllImages(self):
 
         savePath = os.path.join(self.packagePath, "all_images")
-        self.progressWindow.IncrementProgress("Packaging all images...", 1)
+        self.progressBus.publish("Packaging all images...", 1)
+
+        if self.resume and self.isPackageJournaled(savePath):
+
+            self.logger.info("All images package was completed by the interrupted run. Skipping packaging.")
+            return
+
+        if self.packageSettings.get(KEY_COMBINED_SAVE, False):
 
-        if not os.path.exists(savePath):
+            self.packageAllImagesCombined(savePath)
+            return
 
-            os.makedirs(savePath)
+        packagePathList = []
 
         for imageConfig in self.confImageList:
 
             baseImage = imageConfig.get(KEY_BASE_IMAGE, "UnknownBase")
-            packagePath = os.path.join(self.packagePath, f"{baseImage}_latest.tar.gz")
+            packagePath = self.findPackageArchive(os.path.join(self.packagePath, f"{baseImage}_latest"))
 
-            if os.path.exists(packagePath):
+            if packagePath is not None:
+
+                packagePathList.append(packagePath)
+                self.logger.debug(f"Image package {packagePath} added to all images packaging.")
+
+        # The image packages are already compressed, so the bundle is a plain tar around them
+
+        self.checkStagingSpace(savePath, sum(os.path.getsize(packagePath) for packagePath in packagePathList))
+        archivePath = self.createArchive(savePath, packagePathList, COMPRESSION_NONE)
+        self.logger.info(f"All images packaged successfully at {archivePath}")
+
+    def packageAllImagesCombined(self, savePath: str):
+
+        self.logger.info("Combined save selected. Exporting all latest images in a single save stream.")
+        fullImageNameList = []
+
+        for imageConfig in self.confImageList:
 
-                shutil.copy(packagePath, savePath)
-                self.logger.debug(f"Image package {packagePath} copied to {savePath} for all images packaging.")
+            fullImageName = f"{imageConfig.get(KEY_BASE_IMAGE, 'UnknownBase')}:latest"
 
-        self.createArchive(savePath)
-        self.logger.info(f"All images packaged successfully at {savePath}.tar.gz")
\ No newline at end of file
+            try:
+
+                self.client.images.get(fullImageName)
+                fullImageNameList.append(fullImageName)
+
+            except docker.errors.ImageNotFound:
+
+                self.logger.warn(f"Image {fullImageName} not found. Skipping it in the all images package.")
+
+        if len(fullImageNameList) == 0:
+
+            self.logger.warn("No images available for the all images package. Skipping packaging.")
+            return
+
+        self.checkStagingSpace(savePath, sum(self.estimatePackageSize(fullImageName, False, []) for fullImageName in fullImageNameList))
+        compression, compressionLevel = self.resolveCompression()
+
+        with self.openPackageWriter(savePath, compression, compressionLevel) as packageWriter:
+
+            archivePath = packageWriter.archivePath
+            self.progressBus.publish(f"Creating archive {archivePath}...", 0)
+
+            with self.metrics.phase("all_images", "save") as phaseRecord:
+                savedSize = self.saveImageMembers(packageWriter, self.saveImagesCombined(fullImageNameList), "all_images")
+                phaseRecord["Bytes"] = savedSize
+
+            packageWriter.addBytes("manifest.txt", "".join(f"{fullImageName}\n" for fullImageName in fullImageNameList).encode("utf-8"))
+
+        self.removeStalePackages(savePath, archivePath)
+        self.changeOwnership(archivePath)
+        self.journalPackage(savePath, packageWriter)
+        self.logger.info(f"All images packaged successfully at {archivePath} ({savedSize} bytes before compression).")
@@ -0,0 +1,217 @@
+import hashlib
+import json
+import maplex
+import os
+import stat
+import threading
+
+from .config import thaw
+
+class FileHashCache:
+
+    def __init__(self, cachePath: str):
+
+        # Logging setup
+        self.logger = maplex.Logger(__name__)
+
+        # statCache: absolute file path -> [size, mtime_ns, inode, sha256]
+
+        self.cachePath = cachePath
+        self.lock = threading.Lock()
+        self.statCache = {}
+        self.load()
+
+    def load(self):
+
+        if not os.path.exists(self.cachePath):
+
+            self.logger.debug(f"File hash cache {self.cachePath} does not exist. Starting with an empty cache.")
+            return
+
+        try:
+
+            with open(self.cachePath, "r", encoding="utf-8") as f:
+                self.statCache = json.load(f)
+
+            self.logger.debug(f"File hash cache loaded with {len(self.statCache)} file records.")
+
+        except Exception as e:
+
+            self.logger.warn(f"Failed to read file hash cache {self.cachePath}: {e}. Starting with an empty cache.")
+            self.statCache = {}
+
+    def save(self):
+
+        with self.lock:
+
+            tempPath = f"{self.cachePath}.tmp"
+
+            with open(tempPath, "w", encoding="utf-8") as f:
+                json.dump(self.statCache, f)
+
+            os.replace(tempPath, self.cachePath)
+
+        self.logger.debug(f"File hash cache saved to {self.cachePath}.")
+
+    def hashFile(self, filePath: str) -> str:
+
+        # Re-hash the file only when its size, mtime or inode changed since the last run
+
+        filePath = os.path.abspath(filePath)
+        fileStat = os.stat(filePath)
+        statKey = [fileStat.st_size, fileStat.st_mtime_ns, fileStat.st_ino]
+
+        with self.lock:
+            cached = self.statCache.get(filePath)
+
+        if cached is not None and cached[:3] == statKey:
+
+            return cached[3]
+
+        digest = hashlib.sha256()
+
+        with open(filePath, "rb") as f:
+            for chunk in iter(lambda: f.read(1024 * 1024), b""):
+                digest.update(chunk)
+
+        fileDigest = digest.hexdigest()
+
+        with self.lock:
+            self.statCache[filePath] = statKey + [fileDigest]
+
+        return fileDigest
+
+    def fingerprint(self, rootPath: str, relativePathList: list) -> str:
+
+        # Content, type and permission bits of every listed path, in order
+
+        digest = hashlib.sha256()
+
+        for relativePath in relativePathList:
+
+            fullPath = os.path.join(rootPath, relativePath)
+            fileStat = os.lstat(fullPath)
+
+            if stat.S_ISREG(fileStat.st_mode):
+
+                entryDigest = self.hashFile(fullPath)
+
+            elif stat.S_ISLNK(fileStat.st_mode):
+
+                entryDigest = f"link:{os.readlink(fullPath)}"
+
+            else:
+
+                entryDigest = "dir" if stat.S_ISDIR(fileStat.st_mode) else "other"
+
+            digest.update(f"{relativePath}\0{stat.S_IMODE(fileStat.st_mode):o}\0{entryDigest}\n".encode("utf-8"))
+
+        return digest.hexdigest()
+
+    def listTree(self, rootPath: str) -> list:
+
+        relativePathList = []
+
+        for currentDir, dirNames, fileNames in os.walk(rootPath):
+
+            dirNames.sort()
+
+            for fileName in sorted(fileNames):
+
+                filePath = os.path.join(currentDir, fileName)
+
+                if os.path.isfile(filePath):
+
+                    relativePathList.append(os.path.relpath(filePath, rootPath))
+
+        return relativePathList
+
+class BuildCache:
+
+    def __init__(self, cachePath: str, fileHashCache: FileHashCache):
+
+        # Logging setup
+        self.logger = maplex.Logger(__name__)
+
+        # entries: full image name -> {"Key", "ImageId", "PackagePath"}
+
+        self.cachePath = cachePath
+        self.fileHashCache = fileHashCache
+        self.lock = threading.Lock()
+        self.entries = {}
+        self.load()
+
+    def load(self):
+
+        if not os.path.exists(self.cachePath):
+
+            self.logger.debug(f"Build cache {self.cachePath} does not exist. Starting with an empty cache.")
+            return
+
+        try:
+
+            with open(self.cachePath, "r", encoding="utf-8") as f:
+                self.entries = json.load(f).get("Entries", {})
+
+            self.logger.debug(f"Build cache loaded with {len(self.entries)} entries.")
+
+        except Exception as e:
+
+            self.logger.warn(f"Failed to read build cache {self.cachePath}: {e}. Starting with an empty cache.")
+            self.entries = {}
+
+    def save(self):
+
+        with self.lock:
+
+            tempPath = f"{self.cachePath}.tmp"
+
+            with open(tempPath, "w", encoding="utf-8") as f:
+                json.dump({"Entries": self.entries}, f)
+
+            os.replace(tempPath, self.cachePath)
+
+        self.logger.debug(f"Build cache saved to {self.cachePath}.")
+
+    def computeKey(self, contextPath: str, dockerfile: str, buildArgs: dict, contextFileList: list | None = None, parentImageIdList: list | None = None) -> str:
+
+        contextPath = os.path.abspath(contextPath)
+
+        if contextFileList is None:
+
+            contextFileList = self.fileHashCache.listTree(contextPath)
+
+        keyDigest = hashlib.sha256()
+
+        # Build arguments read from the config store are frozen views, json only takes plain dicts.
+        # Parent image IDs make a rebuilt FROM image invalidate its children.
+        keyDigest.update(json.dumps({"Dockerfile": dockerfile, "BuildArgs": thaw(buildArgs), "Parents": parentImageIdList or []}, sort_keys=True).encode("utf-8"))
+        keyDigest.update(self.fileHashCache.fingerprint(contextPath, contextFileList).encode("utf-8"))
+
+        # The Dockerfile may live outside the context directory
+
+        dockerfilePath = os.path.abspath(os.path.join(contextPath, dockerfile))
+
+        if not dockerfilePath.startswith(contextPath + os.sep) and os.path.isfile(dockerfilePath):
+
+            keyDigest.update(f"{dockerfile}\0{self.fileHashCache.hashFile(dockerfilePath)}\n".encode("utf-8"))
+
+        return keyDigest.hexdigest()
+
+    def lookup(self, fullImageName: str, cacheKey: str) -> dict | None:
+
+        with self.lock:
+            entry = self.entries.get(fullImageName)
+
+        if entry is None or entry.get("Key") != cacheKey:
+
+            return None
+
+        return entry
+
+    def store(self, fullImageName: str, cacheKey: str, imageId: str, packagePath: str):
+
+        with self.lock:
+            self.entries[fullImageName] = {"Key": cacheKey, "ImageId": imageId, "PackagePath": packagePath}
+
+        self.logger.debug(f"Build cache entry stored for {fullImageName} with key {cacheKey}.")
@@ -0,0 +1,78 @@
+import docker
+import maplex
+import threading
+
+DEFAULT_POOL_SIZE = 10
+
+class DockerClientProvider:
+
+    def __init__(self):
+
+        # Logging setup
+        self.logger = maplex.Logger(__name__)
+
+        self.lock = threading.Lock()
+        self.client = None
+        self.poolSize = DEFAULT_POOL_SIZE
+
+    def connect(self) -> docker.DockerClient:
+
+        # API version negotiation happens here, once per process instead of once per click
+
+        self.logger.info(f"Connecting to the Docker daemon with a connection pool of {self.poolSize}.")
+        return docker.from_env(max_pool_size=self.poolSize)
+
+    def close(self):
+
+        with self.lock:
+
+            self.closeClient()
+
+    def closeClient(self):
+
+        if self.client is not None:
+
+            try:
+
+                self.client.close()
+
+            except Exception as e:
+
+                self.logger.debug(f"Closing the Docker client failed: {e}")
+
+            self.client = None
+
+    def getClient(self, poolSize: int | None = None, healthCheck: bool = False) -> docker.DockerClient:
+
+        with self.lock:
+
+            if poolSize is not None and max(1, int(poolSize)) != self.poolSize:
+
+                # A different pool size needs a new connection pool
+
+                self.poolSize = max(1, int(poolSize))
+                self.closeClient()
+
+            if self.client is None:
+
+                self.client = self.connect()
+
+            elif healthCheck:
+
+                try:
+
+                    self.client.ping()
+
+                except Exception as e:
+
+                    self.logger.warn(f"Docker daemon health check failed: {e}. Reconnecting.")
+                    self.closeClient()
+                    self.client = self.connect()
+
+            return self.client
+
+clientProvider = DockerClientProvider()
+
+def getDockerClient(poolSize: int | None = None, healthCheck: bool = False) -> docker.DockerClient:
+
+    return clientProvider.getClient(poolSize, healthCheck)
@@ -0,0 +1,118 @@
+import asyncio
+import maplex
+import shlex
+import threading
+
+TERMINATE_TIMEOUT = 10
+
+class ComposeRunner:
+
+    def __init__(self, outputCallback=None):
+
+        # Logging setup
+        self.logger = maplex.Logger(__name__)
+
+        self.outputCallback = outputCallback
+        self.lock = threading.Lock()
+        self.loop = None
+        self.task = None
+        self.cancelled = False
+
+    def run(self, commandList: list) -> int | None:
+
+        # Blocks the calling thread with its own event loop, so callers run it off the Tk loop.
+        # Returns the exit code, or None when the run was cancelled.
+
+        try:
+
+            return asyncio.run(self.runAsync(commandList))
+
+        except asyncio.CancelledError:
+
+            self.logger.warn(f"Command {shlex.join(commandList)} was cancelled.")
+            return None
+
+    def cancel(self):
+
+        with self.lock:
+
+            self.cancelled = True
+
+            if self.loop is not None:
+
+                self.loop.call_soon_threadsafe(self.task.cancel)
+
+    async def runAsync(self, commandList: list) -> int:
+
+        with self.lock:
+
+            if self.cancelled:
+
+                raise asyncio.CancelledError()
+
+            self.loop = asyncio.get_running_loop()
+            self.task = asyncio.current_task()
+
+        self.logger.info(f"Running command: {shlex.join(commandList)}")
+
+        try:
+
+            process = await asyncio.create_subprocess_exec(*commandList, stdout=asyncio.subprocess.PIPE, stderr=asyncio.subprocess.PIPE)
+
+            try:
+
+                await asyncio.gather(self.readStream(process.stdout), self.readStream(process.stderr))
+                exitCode = await process.wait()
+
+            except asyncio.CancelledError:
+
+                await self.terminate(process)
+                raise
+
+            self.logger.info(f"Command {commandList[0]} exited with code {exitCode}.")
+            return exitCode
+
+        finally:
+
+            with self.lock:
+
+                self.loop = None
+                self.task = None
+
+    async def readStream(self, stream: asyncio.StreamReader):
+
+        # Compose writes its progress to stderr, so both streams are plain output lines
+
+        while True:
+
+            line = await stream.readline()
+
+            if not line:
+
+                break
+
+            outputLine = line.decode("utf-8", "replace").rstrip()
+            self.logger.info(f"[compose] {outputLine}")
+
+            if self.outputCallback is not None:
+
+                self.outputCallback(outputLine)
+
+    async def terminate(self, process: asyncio.subprocess.Process):
+
+        if process.returncode is not None:
+
+            return
+
+        self.logger.info(f"Terminating process {process.pid}.")
+        process.terminate()
+
+        try:
+
+            await asyncio.wait_for(process.wait(), TERMINATE_TIMEOUT)
+
+        except asyncio.TimeoutError:
+
+            self.logger.warn(f"Process {process.pid} did not exit in {TERMINATE_TIMEOUT}s. Killing it.")
+            process.kill()
+            await process.wait()
@@ -0,0 +1,203 @@
+import bz2
+import collections
+import io
+import itertools
+import lzma
+import os
+import struct
+import time
+import zlib
+
+from concurrent.futures import ThreadPoolExecutor
+
+DEFAULT_BLOCK_SIZE = 1024 * 1024
+DICTIONARY_SIZE = 32 * 1024
+
+COMPRESSION_NONE = "none"
+COMPRESSION_GZIP = "gzip"
+COMPRESSION_BZ2 = "bz2"
+COMPRESSION_XZ = "xz"
+COMPRESSION_AUTO = "auto"
+
+COMPRESSION_EXTENSIONS = {
+    COMPRESSION_NONE: ".tar",
+    COMPRESSION_GZIP: ".tar.gz",
+    COMPRESSION_BZ2: ".tar.bz2",
+    COMPRESSION_XZ: ".tar.xz"
+}
+COMPRESSION_DEFAULT_LEVELS = {
+    COMPRESSION_GZIP: 6,
+    COMPRESSION_BZ2: 9,
+    COMPRESSION_XZ: 6
+}
+COMPRESSION_ALIASES = {
+    "stored": COMPRESSION_NONE,
+    "tar": COMPRESSION_NONE,
+    "gz": COMPRESSION_GZIP,
+    "gztar": COMPRESSION_GZIP,
+    "bzip2": COMPRESSION_BZ2,
+    "bztar": COMPRESSION_BZ2,
+    "lzma": COMPRESSION_XZ,
+    "xztar": COMPRESSION_XZ
+}
+
+# Auto mode stores the data as-is when a fast deflate of the sample saves less than 10%
+AUTO_SAMPLE_SIZE = 4 * 1024 * 1024
+AUTO_RATIO_THRESHOLD = 0.9
+
+def compressBlock(block: bytes, dictionary: bytes, level: int, last: bool) -> bytes:
+
+    # Raw deflate primed with the tail of the previous block, like pigz.
+    # Non-final blocks end on a sync flush so the pieces concatenate into one deflate stream.
+
+    if dictionary:
+
+        compressor = zlib.compressobj(level, zlib.DEFLATED, -zlib.MAX_WBITS, zdict=dictionary)
+
+    else:
+
+        compressor = zlib.compressobj(level, zlib.DEFLATED, -zlib.MAX_WBITS)
+
+    return compressor.compress(block) + compressor.flush(zlib.Z_FINISH if last else zlib.Z_SYNC_FLUSH)
+
+class ParallelGzipWriter(io.RawIOBase):
+
+    def __init__(self, fileobj, level: int = 6, threads: int | None = None, blockSize: int = DEFAULT_BLOCK_SIZE):
+
+        self.fileobj = fileobj
+        self.level = level
+        self.threads = threads if threads else (os.cpu_count() or 1)
+        self.blockSize = blockSize
+        self.executor = ThreadPoolExecutor(max_workers=self.threads, thread_name_prefix="GzipWorker")
+        self.pending = collections.deque()
+        self.buffer = bytearray()
+        self.dictionary = b""
+        self.crc = 0
+        self.size = 0
+
+        # gzip member header: magic, deflate, no flags, mtime, extra flags, OS unix
+        self.fileobj.write(b"\x1f\x8b\x08\x00" + struct.pack("<I", int(time.time())) + b"\x00\x03")
+
+    def writable(self):
+
+        return True
+
+    def write(self, data) -> int:
+
+        if self.closed:
+
+            raise ValueError("write to closed ParallelGzipWriter")
+
+        self.buffer += data
+
+        while len(self.buffer) >= self.blockSize:
+
+            block = bytes(self.buffer[:self.blockSize])
+            del self.buffer[:self.blockSize]
+            self.submitBlock(block, False)
+
+        return len(data)
+
+    def submitBlock(self, block: bytes, last: bool):
+
+        self.crc = zlib.crc32(block, self.crc)
+        self.size += len(block)
+        self.pending.append(self.executor.submit(compressBlock, block, self.dictionary, self.level, last))
+        self.dictionary = block[-DICTIONARY_SIZE:]
+
+        # Bound memory by keeping at most two blocks per worker in flight
+
+        while len(self.pending) > self.threads * 2:
+
+            self.fileobj.write(self.pending.popleft().result())
+
+    def close(self):
+
+        if self.closed:
+
+            return
+
+        try:
+
+            self.submitBlock(bytes(self.buffer), True)
+            self.buffer.clear()
+
+            while self.pending:
+
+                self.fileobj.write(self.pending.popleft().result())
+
+            self.fileobj.write(struct.pack("<II", self.crc & 0xFFFFFFFF, self.size & 0xFFFFFFFF))
+
+        finally:
+
+            self.executor.shutdown(wait=True, cancel_futures=True)
+            self.fileobj.close()
+            super().close()
+
+def normalizeCompression(compression: str | None) -> str:
+
+    if compression is None:
+
+        return COMPRESSION_GZIP
+
+    compression = COMPRESSION_ALIASES.get(str(compression).lower(), str(compression).lower())
+
+    if compression not in COMPRESSION_EXTENSIONS and compression != COMPRESSION_AUTO:
+
+        raise ValueError(f"Unsupported compression: {compression}")
+
+    return compression
+
+def peekStream(chunks, sampleSize: int = AUTO_SAMPLE_SIZE) -> tuple[bytes, object]:
+
+    # The sampled chunks are replayed in front of the rest, so the stream is still read only once
+
+    chunks = iter(chunks)
+    sampledChunks = []
+    sampleLength = 0
+
+    for chunk in chunks:
+
+        sampledChunks.append(chunk)
+        sampleLength += len(chunk)
+
+        if sampleLength >= sampleSize:
+
+            break
+
+    return b"".join(sampledChunks)[:sampleSize], itertools.chain(sampledChunks, chunks)
+
+def detectCompression(sample: bytes) -> str:
+
+    if not sample:
+
+        return COMPRESSION_GZIP
+
+    ratio = len(zlib.compress(sample, 1)) / len(sample)
+    return COMPRESSION_NONE if ratio > AUTO_RATIO_THRESHOLD else COMPRESSION_GZIP
+
+def openCompressedFile(fileobj, compression: str, level: int | None = None, threads: int | None = None):
+
+    # The caller owns fileobj and closes it after the compressor
+
+    if level is None:
+
+        level = COMPRESSION_DEFAULT_LEVELS.get(compression, 0)
+
+    if compression == COMPRESSION_NONE:
+
+        return fileobj
+
+    if compression == COMPRESSION_GZIP:
+
+        return ParallelGzipWriter(fileobj, level, threads)
+
+    if compression == COMPRESSION_BZ2:
+
+        return bz2.BZ2File(fileobj, "wb", compresslevel=level)
+
+    if compression == COMPRESSION_XZ:
+
+        return lzma.LZMAFile(fileobj, "wb", preset=level)
+
+    raise ValueError(f"Unsupported compression: {compression}")
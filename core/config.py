@@ -0,0 +1,147 @@
+import json
+import maplex
+import os
+import tempfile
+import threading
+
+from types import MappingProxyType
+
+from statics import *
+
+def freeze(value):
+
+    # Shared views must not be changed in place by one reader behind the others' backs
+
+    if isinstance(value, dict):
+
+        return MappingProxyType({key: freeze(item) for key, item in value.items()})
+
+    if isinstance(value, list):
+
+        return tuple(freeze(item) for item in value)
+
+    return value
+
+def thaw(value):
+
+    if isinstance(value, (dict, MappingProxyType)):
+
+        return {key: thaw(item) for key, item in value.items()}
+
+    if isinstance(value, (list, tuple)):
+
+        return [thaw(item) for item in value]
+
+    return value
+
+class ConfigStore:
+
+    def __init__(self, configPath: str = "config.json"):
+
+        # Logging setup
+        self.logger = maplex.Logger(__name__)
+
+        self.configPath = configPath
+        self.lock = threading.Lock()
+        self.data = None
+        self.signature = None
+
+    def getSignature(self) -> tuple:
+
+        # The path is resolved on every call, so a changed working directory is a different file
+
+        configPath = os.path.abspath(self.configPath)
+        fileStat = os.stat(configPath)
+
+        return (configPath, fileStat.st_mtime_ns, fileStat.st_size)
+
+    def load(self) -> MappingProxyType:
+
+        with self.lock:
+
+            signature = self.getSignature()
+
+            if self.data is None or signature != self.signature:
+
+                with open(signature[0], "r", encoding="utf-8") as f:
+                    self.data = freeze(json.load(f))
+
+                self.signature = signature
+                self.logger.debug(f"Configuration {signature[0]} parsed.")
+
+            return self.data
+
+    def read(self, key: str | None = None) -> MappingProxyType:
+
+        configData = self.load()
+
+        return configData if key is None else configData.get(key, MappingProxyType({}))
+
+    def readMutable(self) -> dict:
+
+        # A private deep copy for callers that build the next version of the file
+
+        return thaw(self.load())
+
+    def write(self, configData: dict):
+
+        # Write a temporary file next to the config and rename it over, a crash never leaves a truncated file
+
+        with self.lock:
+
+            configPath = os.path.abspath(self.configPath)
+            configDirectory = os.path.dirname(configPath)
+            tempFile = tempfile.NamedTemporaryFile("w", encoding="utf-8", dir=configDirectory, prefix=".config-", suffix=".json", delete=False)
+
+            try:
+
+                with tempFile:
+
+                    json.dump(thaw(configData), tempFile, indent=4, ensure_ascii=False)
+                    tempFile.flush()
+                    os.fsync(tempFile.fileno())
+
+                if os.path.exists(configPath):
+
+                    os.chmod(tempFile.name, os.stat(configPath).st_mode & 0o7777)
+
+                os.replace(tempFile.name, configPath)
+
+            except Exception:
+
+                if os.path.exists(tempFile.name):
+
+                    os.remove(tempFile.name)
+
+                raise
+
+            self.data = freeze(thaw(configData))
+            self.signature = self.getSignature()
+            self.logger.debug(f"Configuration {configPath} written.")
+
+    @property
+    def applicationSettings(self) -> MappingProxyType:
+
+        return self.read(KEY_OP_APPLICATION)
+
+    @property
+    def imageList(self) -> tuple:
+
+        return self.applicationSettings.get(KEY_OP_IMAGES, ())
+
+    @property
+    def buildSettings(self) -> MappingProxyType:
+
+        return self.applicationSettings.get(KEY_OP_BUILD, MappingProxyType({}))
+
+    @property
+    def packageSettings(self) -> MappingProxyType:
+
+        return self.applicationSettings.get(KEY_OP_PACKAGE, MappingProxyType({}))
+
+    @property
+    def loggerSettings(self) -> MappingProxyType:
+
+        return self.read(KEY_OP_LOGGER)
+
+configStore = ConfigStore("config.json")
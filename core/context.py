@@ -0,0 +1,86 @@
+import hashlib
+import maplex
+import os
+import tempfile
+
+from docker.utils.build import create_archive, exclude_paths
+
+from .cache import FileHashCache
+
+class ContextCache:
+
+    def __init__(self, cacheDirectory: str, fileHashCache: FileHashCache):
+
+        # Logging setup
+        self.logger = maplex.Logger(__name__)
+
+        self.cacheDirectory = cacheDirectory
+        self.fileHashCache = fileHashCache
+        os.makedirs(self.cacheDirectory, exist_ok=True)
+
+    def readDockerignore(self, contextPath: str) -> list:
+
+        # Same parsing docker-py applies before it tars a context itself
+
+        dockerignorePath = os.path.join(contextPath, ".dockerignore")
+
+        if not os.path.exists(dockerignorePath):
+
+            return []
+
+        with open(dockerignorePath, "r") as f:
+            return [line.strip() for line in f.read().splitlines() if line.strip() != "" and line.strip()[0] != "#"]
+
+    def isInsideContext(self, contextPath: str, dockerfile: str) -> bool:
+
+        contextPath = os.path.abspath(contextPath)
+        dockerfilePath = os.path.abspath(os.path.join(contextPath, dockerfile))
+
+        return dockerfilePath.startswith(contextPath + os.sep)
+
+    def listFiles(self, contextPath: str, dockerfile: str) -> list:
+
+        contextPath = os.path.abspath(contextPath)
+        return sorted(exclude_paths(contextPath, self.readDockerignore(contextPath), dockerfile=dockerfile))
+
+    def getArchive(self, contextPath: str, dockerfile: str, contextFileList: list, fingerprint: str) -> str:
+
+        # Archives are named <context id>-<fingerprint>.tar so older archives of the same context can be pruned.
+        # Images sharing a context with different Dockerfiles filter it differently, so the Dockerfile is part of the id.
+
+        contextPath = os.path.abspath(contextPath)
+        contextId = hashlib.sha256(f"{contextPath}\n{dockerfile}".encode("utf-8")).hexdigest()[:16]
+        archivePath = os.path.join(self.cacheDirectory, f"{contextId}-{fingerprint}.tar")
+
+        if os.path.exists(archivePath):
+
+            self.logger.debug(f"Reusing cached build context {archivePath} for {contextPath}.")
+            return archivePath
+
+        self.logger.info(f"Creating build context archive for {contextPath} with {len(contextFileList)} entries.")
+        tempFile = tempfile.NamedTemporaryFile(dir=self.cacheDirectory, prefix="incoming-", suffix=".tar", delete=False)
+
+        try:
+
+            with tempFile:
+
+                create_archive(contextPath, files=contextFileList, fileobj=tempFile)
+
+            os.replace(tempFile.name, archivePath)
+
+        except Exception:
+
+            if os.path.exists(tempFile.name):
+
+                os.remove(tempFile.name)
+
+            raise
+
+        for cachedName in os.listdir(self.cacheDirectory):
+
+            if cachedName.startswith(f"{contextId}-") and cachedName != os.path.basename(archivePath):
+
+                os.remove(os.path.join(self.cacheDirectory, cachedName))
+                self.logger.debug(f"Outdated build context {cachedName} removed.")
+
+        return archivePath
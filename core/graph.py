@@ -0,0 +1,146 @@
+import maplex
+import os
+import re
+
+from statics import *
+
+FROM_PATTERN = re.compile(r"^\s*FROM\s+(?:--\S+\s+)*(\S+)(?:\s+AS\s+(\S+))?\s*$", re.IGNORECASE)
+ARG_PATTERN = re.compile(r"^\s*ARG\s+([A-Za-z_][A-Za-z0-9_]*)(?:=(\S*))?\s*$", re.IGNORECASE)
+VARIABLE_PATTERN = re.compile(r"\$\{([A-Za-z_][A-Za-z0-9_]*)\}|\$([A-Za-z_][A-Za-z0-9_]*)")
+
+class DependencyCycleError(Exception):
+
+    pass
+
+def getRepository(imageReference: str) -> str:
+
+    # sample, sample:1.0.0 and sample@sha256:... all name the repository sample, registry ports are kept
+
+    repository = imageReference.split("@", 1)[0]
+    namePart, separator, tag = repository.rpartition(":")
+
+    if separator != "" and "/" not in tag:
+
+        repository = namePart
+
+    return repository.removeprefix("docker.io/library/").removeprefix("library/")
+
+def readFromImages(dockerfilePath: str, buildArgs: dict) -> list:
+
+    # Build arguments declared before a FROM may name the base image, so they are substituted
+
+    argumentMap = {}
+    stageNameSet = set()
+    fromImageList = []
+    fromSeen = False
+
+    with open(dockerfilePath, "r", encoding="utf-8") as f:
+        lineList = f.read().replace("\\\n", " ").splitlines()
+
+    for line in lineList:
+
+        argMatch = ARG_PATTERN.match(line)
+
+        if argMatch is not None and not fromSeen:
+
+            argumentMap[argMatch.group(1)] = str(buildArgs.get(argMatch.group(1), argMatch.group(2) or ""))
+            continue
+
+        fromMatch = FROM_PATTERN.match(line)
+
+        if fromMatch is None:
+
+            continue
+
+        fromSeen = True
+        imageReference = VARIABLE_PATTERN.sub(lambda match: argumentMap.get(match.group(1) or match.group(2), ""), fromMatch.group(1))
+
+        if imageReference.lower() not in stageNameSet and imageReference.lower() != "scratch":
+
+            fromImageList.append(imageReference)
+
+        if fromMatch.group(2) is not None:
+
+            stageNameSet.add(fromMatch.group(2).lower())
+
+    return fromImageList
+
+class ImageGraph:
+
+    def __init__(self, imageConfigList: list):
+
+        # Logging setup
+        self.logger = maplex.Logger(__name__)
+
+        self.imageNameList = [imageConfig.get(KEY_NAME, "Unnamed Image") for imageConfig in imageConfigList]
+        repositoryMap = {getRepository(imageConfig.get(KEY_BASE_IMAGE, "UnknownBase")): imageName for imageConfig, imageName in zip(imageConfigList, self.imageNameList)}
+        self.parentMap = {imageName: set() for imageName in self.imageNameList}
+        self.childMap = {imageName: set() for imageName in self.imageNameList}
+        self.fromMap = {imageName: [] for imageName in self.imageNameList}
+
+        for imageConfig, imageName in zip(imageConfigList, self.imageNameList):
+
+            dockerfilePath = os.path.join(imageConfig.get(KEY_CONTEXT_PATH, "."), imageConfig.get(KEY_DOCKERFILE, "Dockerfile"))
+
+            if not os.path.exists(dockerfilePath):
+
+                self.logger.debug(f"Dockerfile {dockerfilePath} of image {imageName} not found. It is treated as having no dependencies.")
+                continue
+
+            self.fromMap[imageName] = readFromImages(dockerfilePath, imageConfig.get(KEY_BUILD_ARGS, {}))
+
+            for fromImage in self.fromMap[imageName]:
+
+                parentName = repositoryMap.get(getRepository(fromImage))
+
+                if parentName == imageName:
+
+                    self.logger.debug(f"Image {imageName} is built FROM an earlier build of itself. This is not a dependency.")
+
+                elif parentName is not None:
+
+                    self.parentMap[imageName].add(parentName)
+                    self.childMap[parentName].add(imageName)
+                    self.logger.debug(f"Image {imageName} depends on image {parentName} through FROM {fromImage}.")
+
+        self.checkCycles()
+
+    def checkCycles(self):
+
+        # Fail before anything is built, naming the images caught in the cycle
+
+        pendingCountMap = {imageName: len(parentSet) for imageName, parentSet in self.parentMap.items()}
+        readyList = [imageName for imageName in self.imageNameList if pendingCountMap[imageName] == 0]
+
+        while len(readyList) > 0:
+
+            imageName = readyList.pop()
+
+            for childName in self.childMap[imageName]:
+
+                pendingCountMap[childName] -= 1
+
+                if pendingCountMap[childName] == 0:
+
+                    readyList.append(childName)
+
+        cycleList = [imageName for imageName in self.imageNameList if pendingCountMap[imageName] > 0]
+
+        if len(cycleList) > 0:
+
+            raise DependencyCycleError(f"Images depend on each other in a cycle: {', '.join(cycleList)}")
+
+    def levels(self) -> list:
+
+        # Images of one level only depend on earlier levels, config order is kept inside a level
+
+        levelList = []
+        placedSet = set()
+
+        while len(placedSet) < len(self.imageNameList):
+
+            level = [imageName for imageName in self.imageNameList if imageName not in placedSet and self.parentMap[imageName] <= placedSet]
+            levelList.append(level)
+            placedSet.update(level)
+
+        return levelList
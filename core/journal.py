@@ -0,0 +1,112 @@
+import hashlib
+import json
+import maplex
+import os
+import threading
+import time
+
+PHASE_RUN = "run"
+PHASE_BUILT = "built"
+PHASE_PACKAGED = "packaged"
+PHASE_CONFIG_UPDATED = "config-updated"
+
+def hashFile(filePath: str) -> str:
+
+    sha256 = hashlib.sha256()
+
+    with open(filePath, "rb") as f:
+
+        for chunk in iter(lambda: f.read(1024 * 1024), b""):
+
+            sha256.update(chunk)
+
+    return sha256.hexdigest()
+
+class PhaseJournal:
+
+    def __init__(self, journalPath: str):
+
+        # Logging setup
+        self.logger = maplex.Logger(__name__)
+
+        self.journalPath = journalPath
+        self.lock = threading.Lock()
+        self.entries = {}
+        self.load()
+
+    def load(self):
+
+        if not os.path.exists(self.journalPath):
+
+            return
+
+        with open(self.journalPath, "r", encoding="utf-8") as f:
+
+            for line in f:
+
+                try:
+
+                    entry = json.loads(line)
+
+                except json.JSONDecodeError:
+
+                    # A crash can leave the last line half written
+
+                    self.logger.warn(f"Skipping an incomplete entry in {self.journalPath}.")
+                    continue
+
+                self.entries[(entry["Phase"], entry["Target"])] = entry
+
+        self.logger.debug(f"Build journal {self.journalPath} loaded with {len(self.entries)} entries.")
+
+    def get(self, phase: str, target: str) -> dict | None:
+
+        with self.lock:
+            return self.entries.get((phase, target))
+
+    def record(self, phase: str, target: str, **details):
+
+        # Every entry is flushed to disk before the next phase starts
+
+        entry = {"Phase": phase, "Target": target, "Time": int(time.time()), **details}
+
+        with self.lock:
+
+            with open(self.journalPath, "a", encoding="utf-8") as f:
+                f.write(json.dumps(entry) + "\n")
+                f.flush()
+                os.fsync(f.fileno())
+
+            self.entries[(phase, target)] = entry
+
+        self.logger.debug(f"Journal: phase {phase} completed for {target}.")
+
+    def clear(self):
+
+        with self.lock:
+
+            if os.path.exists(self.journalPath):
+
+                os.remove(self.journalPath)
+
+            self.entries = {}
+
+    def isPackageValid(self, target: str, archivePath: str) -> bool:
+
+        entry = self.get(PHASE_PACKAGED, target)
+
+        if entry is None or entry.get("Archive") != archivePath or not os.path.exists(archivePath):
+
+            return False
+
+        if os.path.getsize(archivePath) != entry.get("Size"):
+
+            self.logger.info(f"Package {archivePath} changed size since it was journaled.")
+            return False
+
+        if hashFile(archivePath) != entry.get("Sha256"):
+
+            self.logger.info(f"Package {archivePath} changed content since it was journaled.")
+            return False
+
+        return True
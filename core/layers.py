@@ -0,0 +1,246 @@
+import hashlib
+import json
+import maplex
+import os
+import re
+import tarfile
+import tempfile
+import threading
+
+def isLayerMember(memberName: str) -> bool:
+
+    # Legacy save layout keeps layers as <id>/layer.tar, the OCI layout as blobs/sha256/<digest>
+
+    return memberName.startswith("blobs/") or memberName.endswith("/layer.tar")
+
+def isSafeMemberName(memberName: str) -> bool:
+
+    # Member names are joined below a work directory on the target, absolute names or .. parts would escape it
+
+    return memberName != "" and not os.path.isabs(memberName) and memberName[0] not in "/\\" and ".." not in re.split(r"[/\\]", memberName)
+
+class LayerStore:
+
+    def __init__(self, storePath: str):
+
+        # Logging setup
+        self.logger = maplex.Logger(__name__)
+
+        self.storePath = storePath
+        self.blobDirectory = os.path.join(storePath, "sha256")
+        self.indexDirectory = os.path.join(storePath, "index")
+        self.lock = threading.Lock()
+
+        os.makedirs(self.blobDirectory, exist_ok=True)
+        os.makedirs(self.indexDirectory, exist_ok=True)
+
+    def blobPath(self, digest: str) -> str:
+
+        return os.path.join(self.blobDirectory, digest.split(":", 1)[-1])
+
+    def has(self, digest: str) -> bool:
+
+        return os.path.exists(self.blobPath(digest))
+
+    def put(self, fileobj) -> tuple[str, int]:
+
+        # Stream into a temporary file while hashing, then move it under its digest
+
+        digest = hashlib.sha256()
+        size = 0
+        tempFile = tempfile.NamedTemporaryFile(dir=self.storePath, prefix="incoming-", delete=False)
+
+        try:
+
+            with tempFile:
+
+                for chunk in iter(lambda: fileobj.read(1024 * 1024), b""):
+
+                    digest.update(chunk)
+                    tempFile.write(chunk)
+                    size += len(chunk)
+
+            layerDigest = f"sha256:{digest.hexdigest()}"
+
+            if self.has(layerDigest):
+
+                os.remove(tempFile.name)
+
+            else:
+
+                os.replace(tempFile.name, self.blobPath(layerDigest))
+                self.logger.debug(f"Layer {layerDigest} ({size} bytes) added to the layer store.")
+
+        except Exception:
+
+            if os.path.exists(tempFile.name):
+
+                os.remove(tempFile.name)
+
+            raise
+
+        return layerDigest, size
+
+    def indexPath(self, baseImage: str) -> str:
+
+        return os.path.join(self.indexDirectory, f"{baseImage.replace('/', '_')}.json")
+
+    def readIndex(self, baseImage: str) -> list:
+
+        indexPath = self.indexPath(baseImage)
+
+        if not os.path.exists(indexPath):
+
+            return []
+
+        with open(indexPath, "r", encoding="utf-8") as f:
+            return json.load(f)
+
+    def previousRelease(self, baseImage: str, version: str) -> dict | None:
+
+        releases = [release for release in self.readIndex(baseImage) if release.get("Version") != version]
+        return releases[-1] if releases else None
+
+    def recordRelease(self, baseImage: str, version: str, digests: list):
+
+        with self.lock:
+
+            releases = [release for release in self.readIndex(baseImage) if release.get("Version") != version]
+            releases.append({"Image": baseImage, "Version": version, "Layers": digests})
+            self.writeIndex(self.indexPath(baseImage), releases)
+
+        self.logger.debug(f"Release {baseImage}:{version} recorded with {len(digests)} layers.")
+
+    def forgetImage(self, baseImage: str):
+
+        # The next release of the image is a full package again, its layers go with the next prune
+
+        with self.lock:
+
+            if os.path.exists(self.indexPath(baseImage)):
+
+                os.remove(self.indexPath(baseImage))
+
+        self.logger.debug(f"Releases of {baseImage} removed from the layer store index.")
+
+    def writeIndex(self, indexPath: str, releases: list):
+
+        with open(f"{indexPath}.tmp", "w", encoding="utf-8") as f:
+            json.dump(releases, f, indent=4)
+
+        os.replace(f"{indexPath}.tmp", indexPath)
+
+    def prune(self, keepReleases) -> tuple[int, int]:
+
+        # keepReleases(releases) returns the releases of one image that stay recorded.
+        # Layers no remaining release refers to are deleted afterwards.
+
+        removedReleases = 0
+        removedBytes = 0
+
+        with self.lock:
+
+            keptDigests = set()
+
+            for indexName in sorted(os.listdir(self.indexDirectory)):
+
+                if not indexName.endswith(".json"):
+
+                    continue
+
+                indexPath = os.path.join(self.indexDirectory, indexName)
+
+                with open(indexPath, "r", encoding="utf-8") as f:
+                    releases = json.load(f)
+
+                keptList = keepReleases(releases)
+
+                if len(keptList) == 0:
+
+                    os.remove(indexPath)
+
+                elif len(keptList) != len(releases):
+
+                    self.writeIndex(indexPath, keptList)
+
+                removedReleases += len(releases) - len(keptList)
+
+                for release in keptList:
+
+                    keptDigests.update(release.get("Layers", []))
+
+            for blobName in os.listdir(self.blobDirectory):
+
+                if f"sha256:{blobName}" not in keptDigests:
+
+                    blobPath = os.path.join(self.blobDirectory, blobName)
+                    removedBytes += os.path.getsize(blobPath)
+                    os.remove(blobPath)
+
+        self.logger.info(f"Layer store {self.storePath} pruned: {removedReleases} releases and {removedBytes} bytes of layers removed.")
+
+        return removedReleases, removedBytes
+
+    def checkManifest(self, manifest: dict):
+
+        for member in manifest.get("Members", []):
+
+            if not isSafeMemberName(member.get("Name", "")):
+
+                raise ValueError(f"Delta manifest member {member.get('Name')!r} is not a relative path inside the image archive.")
+
+            if "Digest" in member and re.fullmatch(r"sha256:[0-9a-f]{64}", member["Digest"]) is None:
+
+                raise ValueError(f"Delta manifest member {member['Name']} has an invalid layer digest {member['Digest']!r}.")
+
+    def missingLayers(self, manifest: dict) -> list:
+
+        return [member["Digest"] for member in manifest.get("Members", []) if "Digest" in member and not self.has(member["Digest"])]
+
+    def assemble(self, deltaDirectory: str, outputPath: str, manifest: dict | None = None):
+
+        # Rebuild the full docker save archive from a delta package's small files and this store.
+        # Layers are read from the store whenever it has them, so only non-layer files need extracting.
+
+        if manifest is None:
+
+            with open(os.path.join(deltaDirectory, "delta.json"), "r", encoding="utf-8") as f:
+                manifest = json.load(f)
+
+        self.checkManifest(manifest)
+
+        with tarfile.open(outputPath, "w") as outputArchive:
+
+            for member in manifest.get("Members", []):
+
+                tarInfo = tarfile.TarInfo(member["Name"])
+                tarInfo.mode = member.get("Mode", 0o644)
+                tarInfo.mtime = member.get("Mtime", 0)
+
+                if member["Type"] == "dir":
+
+                    tarInfo.type = tarfile.DIRTYPE
+                    outputArchive.addfile(tarInfo)
+
+                elif member["Type"] == "symlink":
+
+                    tarInfo.type = tarfile.SYMTYPE
+                    tarInfo.linkname = member["LinkName"]
+                    outputArchive.addfile(tarInfo)
+
+                else:
+
+                    if "Digest" in member and self.has(member["Digest"]):
+
+                        sourcePath = self.blobPath(member["Digest"])
+
+                    else:
+
+                        sourcePath = os.path.join(deltaDirectory, "image", member["Name"])
+
+                    tarInfo.size = member["Size"]
+
+                    with open(sourcePath, "rb") as sourceFile:
+                        outputArchive.addfile(tarInfo, sourceFile)
+
+        self.logger.info(f"Image archive {outputPath} assembled from delta package {deltaDirectory}.")
@@ -0,0 +1,142 @@
+import json
+import maplex
+import os
+import shutil
+import tarfile
+import tempfile
+
+from .layers import LayerStore, isLayerMember, isSafeMemberName
+
+class PackageLoader:
+
+    def __init__(self, storePath: str, client=None):
+
+        # Logging setup
+        self.logger = maplex.Logger(__name__)
+
+        # The target keeps its own layer store, filled only from packages delivered to it
+
+        self.layerStore = LayerStore(storePath)
+        self.client = client
+
+    def importPackage(self, archivePath: str, workDirectory: str) -> dict:
+
+        # Layers go into the store, the small save archive files are extracted next to delta.json.
+        # Full packages have no delta.json, their member list is collected while streaming instead.
+
+        manifest = None
+        memberList = []
+
+        with tarfile.open(archivePath, "r|*") as packageArchive:
+
+            for member in packageArchive:
+
+                if member.name == "delta.json":
+
+                    manifest = json.load(packageArchive.extractfile(member))
+                    continue
+
+                if not member.name.startswith("image/"):
+
+                    continue
+
+                memberName = member.name.removeprefix("image/")
+
+                if not isSafeMemberName(memberName):
+
+                    raise ValueError(f"Package {archivePath} contains member {member.name!r} outside the image directory.")
+
+                memberEntry = {"Name": memberName, "Mode": member.mode, "Mtime": member.mtime}
+
+                if member.isdir():
+
+                    memberEntry["Type"] = "dir"
+
+                elif member.issym():
+
+                    memberEntry.update({"Type": "symlink", "LinkName": member.linkname})
+
+                elif member.isfile() and isLayerMember(memberName):
+
+                    layerDigest, layerSize = self.layerStore.put(packageArchive.extractfile(member))
+                    memberEntry.update({"Type": "file", "Size": layerSize, "Digest": layerDigest})
+
+                elif member.isfile():
+
+                    filePath = os.path.join(workDirectory, "image", memberName)
+                    os.makedirs(os.path.dirname(filePath), exist_ok=True)
+
+                    with open(filePath, "wb") as f:
+                        shutil.copyfileobj(packageArchive.extractfile(member), f)
+
+                    memberEntry.update({"Type": "file", "Size": member.size})
+
+                else:
+
+                    continue
+
+                memberList.append(memberEntry)
+
+        if manifest is None:
+
+            if len(memberList) == 0:
+
+                raise ValueError(f"Package {archivePath} contains no image.")
+
+            # A full package is not a release other deltas build on, its layers go with the next prune
+
+            manifest = {"Image": self.readImageName(workDirectory, archivePath), "BaseVersion": None, "Members": memberList}
+            self.logger.info(f"Full package {archivePath} of {manifest['Image']} imported.")
+
+            return manifest
+
+        self.layerStore.checkManifest(manifest)
+        missingList = self.layerStore.missingLayers(manifest)
+
+        if len(missingList) > 0:
+
+            raise ValueError(f"Package {archivePath} needs {len(missingList)} layers of release {manifest.get('BaseVersion')} that were never loaded here. Load that release package first.")
+
+        baseImage, version = manifest["Image"].rsplit(":", 1)
+        self.layerStore.recordRelease(baseImage, version, [member["Digest"] for member in manifest.get("Members", []) if "Digest" in member])
+        self.logger.info(f"Delta package {archivePath} of {manifest['Image']} imported into the layer store.")
+
+        return manifest
+
+    def readImageName(self, workDirectory: str, archivePath: str) -> str:
+
+        manifestPath = os.path.join(workDirectory, "image", "manifest.json")
+
+        if not os.path.exists(manifestPath):
+
+            return os.path.basename(archivePath)
+
+        with open(manifestPath, "r", encoding="utf-8") as f:
+            repoTagList = [repoTag for entry in json.load(f) for repoTag in entry.get("RepoTags") or []]
+
+        return ", ".join(repoTagList) or os.path.basename(archivePath)
+
+    def load(self, archivePath: str, outputPath: str | None = None) -> str:
+
+        # Assembles the full save archive and hands it to the local daemon unless an output path is given
+
+        with tempfile.TemporaryDirectory(dir=self.layerStore.storePath, prefix="load-") as workDirectory:
+
+            manifest = self.importPackage(archivePath, workDirectory)
+            imagePath = outputPath or os.path.join(workDirectory, "image.tar")
+            self.layerStore.assemble(workDirectory, imagePath, manifest)
+
+            if outputPath is None:
+
+                with open(imagePath, "rb") as f:
+                    self.client.images.load(f)
+
+                self.logger.info(f"Image {manifest['Image']} loaded into the local Docker daemon.")
+
+        return manifest["Image"]
+
+    def prune(self, keepCount: int = 1) -> tuple[int, int]:
+
+        # The next delta only omits layers of the newest release, so older releases can go
+
+        return self.layerStore.prune(lambda releases: releases[-max(1, keepCount):])
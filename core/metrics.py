@@ -0,0 +1,87 @@
+import json
+import maplex
+import os
+import threading
+import time
+
+from contextlib import contextmanager
+from datetime import datetime
+
+class PipelineMetrics:
+
+    def __init__(self):
+
+        # Logging setup
+        self.logger = maplex.Logger(__name__)
+
+        self.lock = threading.Lock()
+        self.records = []
+        self.buildSteps = {}
+        self.startedAt = datetime.now().isoformat(timespec="seconds")
+
+    @contextmanager
+    def phase(self, target: str, phaseName: str):
+
+        # The caller may set record["Bytes"] inside the block
+
+        record = {"Target": target, "Phase": phaseName, "Bytes": 0, "Status": "ok"}
+        startTime = time.perf_counter()
+
+        try:
+
+            yield record
+
+        except Exception:
+
+            record["Status"] = "failed"
+            raise
+
+        finally:
+
+            record["Seconds"] = round(time.perf_counter() - startTime, 3)
+            record["MBps"] = round(record["Bytes"] / 1048576 / record["Seconds"], 2) if record["Seconds"] > 0 else 0.0
+
+            with self.lock:
+                self.records.append(record)
+
+            self.logger.debug(f"Phase {phaseName} for {target} took {record['Seconds']}s for {record['Bytes']} bytes.")
+
+    def recordBuildSteps(self, target: str, steps: list):
+
+        # Per-step durations and cache results of one docker build, keyed by image
+
+        with self.lock:
+            self.buildSteps[target] = [{**step, "Duration": round(step["Duration"], 3)} for step in steps]
+
+    def write(self, metricsPath: str):
+
+        # One JSON line per run
+
+        with self.lock:
+            runRecord = {"StartedAt": self.startedAt, "Phases": list(self.records), "BuildSteps": dict(self.buildSteps)}
+
+        metricsDirectory = os.path.dirname(metricsPath)
+
+        if metricsDirectory:
+
+            os.makedirs(metricsDirectory, exist_ok=True)
+
+        with open(metricsPath, "a", encoding="utf-8") as f:
+            f.write(json.dumps(runRecord) + "\n")
+
+        self.logger.info(f"Pipeline metrics appended to {metricsPath}.")
+
+    def summaryRows(self) -> list:
+
+        with self.lock:
+            return [(record["Target"], record["Phase"], f"{record['Seconds']:.2f}", f"{record['Bytes'] / 1048576:.1f}", f"{record['MBps']:.1f}", record["Status"]) for record in self.records]
+
+    def summary(self) -> str:
+
+        summaryLines = [f"{'Target':<40} {'Phase':<12} {'Seconds':>9} {'MB':>10} {'MB/s':>8} Status"]
+
+        for target, phaseName, seconds, megabytes, throughput, status in self.summaryRows():
+
+            summaryLines.append(f"{target[:40]:<40} {phaseName:<12} {seconds:>9} {megabytes:>10} {throughput:>8} {status}")
+
+        return "\n".join(summaryLines)
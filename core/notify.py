@@ -0,0 +1,15 @@
+import maplex
+
+# Dialogs are only imported when there is a window to show them on, headless runs never load Tk
+
+logger = maplex.Logger(__name__)
+
+def showError(root, message: str, title: str):
+
+    if root is None:
+
+        logger.error(f"{title}: {message}")
+        return
+
+    from ttkbootstrap.dialogs import Messagebox
+    Messagebox.show_error(message, title, parent=root)
@@ -0,0 +1,277 @@
+import hashlib
+import io
+import maplex
+import os
+import tarfile
+import time
+
+from .compress import COMPRESSION_GZIP, openCompressedFile
+
+STREAM_BUFFER_SIZE = 1024 * 1024
+
+class ChunkReader(io.RawIOBase):
+
+    def __init__(self, chunks):
+
+        self.chunks = iter(chunks)
+        self.buffer = memoryview(b"")
+
+    def readable(self):
+
+        return True
+
+    def readinto(self, buffer):
+
+        while len(self.buffer) == 0:
+
+            chunk = next(self.chunks, None)
+
+            if chunk is None:
+
+                return 0
+
+            self.buffer = memoryview(chunk)
+
+        size = min(len(buffer), len(self.buffer))
+        buffer[:size] = self.buffer[:size]
+        self.buffer = self.buffer[size:]
+
+        return size
+
+class FixedSizeReader(io.RawIOBase):
+
+    def __init__(self, fileobj, size: int):
+
+        self.fileobj = fileobj
+        self.remaining = size
+        self.shortfall = 0
+
+    def readable(self):
+
+        return True
+
+    def readinto(self, buffer):
+
+        if self.remaining <= 0:
+
+            return 0
+
+        view = memoryview(buffer)[:self.remaining]
+        size = self.fileobj.readinto(view)
+
+        # A live file that shrank after its header was written is padded with zeros, like GNU tar does
+
+        if not size:
+
+            size = len(view)
+            view[:size] = bytes(size)
+            self.shortfall += size
+
+        self.remaining -= size
+
+        return size
+
+class HashingWriter(io.RawIOBase):
+
+    def __init__(self, fileobj):
+
+        # Hashes the compressed bytes on their way to disk, so the package checksum costs no extra read
+
+        self.fileobj = fileobj
+        self.sha256 = hashlib.sha256()
+        self.size = 0
+
+    def writable(self):
+
+        return True
+
+    def write(self, data) -> int:
+
+        self.sha256.update(data)
+        self.size += len(data)
+
+        return self.fileobj.write(data)
+
+    def close(self):
+
+        if not self.closed:
+
+            self.fileobj.close()
+
+        super().close()
+
+class PackageWriter:
+
+    def __init__(self, archivePath: str, compression: str = COMPRESSION_GZIP, compressionLevel: int | None = None, compressionThreads: int | None = None):
+
+        # Logging setup
+        self.logger = maplex.Logger(__name__)
+
+        # The archive is written under a temporary name and renamed on close,
+        # so a failed run never leaves a truncated package at the final path
+
+        self.archivePath = archivePath
+        self.tempPath = f"{archivePath}.part"
+        self.outputFile = HashingWriter(open(self.tempPath, "wb"))
+        self.compressedFile = openCompressedFile(self.outputFile, compression, compressionLevel, compressionThreads)
+        self.sha256 = None
+        self.size = None
+        self.archive = tarfile.open(fileobj=self.compressedFile, mode="w|")
+        self.logger.debug(f"Package writer opened for {self.archivePath} with {compression} compression.")
+
+    def __enter__(self):
+
+        return self
+
+    def __exit__(self, excType, excValue, traceback):
+
+        if excType is None:
+
+            self.close()
+
+        else:
+
+            self.abort()
+
+        return False
+
+    def addPath(self, arcName: str, path: str, fileFilter=None) -> dict:
+
+        # Walk the source and stream each file into the archive as it is read.
+        # Entries that vanish or cannot be read are skipped instead of failing the whole package.
+
+        stats = {"Files": 0, "Bytes": 0, "Skipped": 0, "Unchanged": 0, "SkippedPaths": []}
+        pendingEntries = [(arcName, path)]
+
+        while pendingEntries:
+
+            entryArcName, entryPath = pendingEntries.pop()
+
+            try:
+
+                tarInfo = self.archive.gettarinfo(entryPath, entryArcName)
+
+            except OSError as e:
+
+                self.logger.warn(f"Skipping {entryPath}: {e}")
+                stats["Skipped"] += 1
+                continue
+
+            if tarInfo is None:
+
+                self.logger.warn(f"Skipping {entryPath}: unsupported file type.")
+                stats["Skipped"] += 1
+                continue
+
+            # With a filter the target of a hard link may not be packed, so links are stored as files
+
+            if fileFilter is not None and tarInfo.islnk():
+
+                try:
+
+                    tarInfo.size = os.stat(entryPath).st_size
+
+                except OSError as e:
+
+                    self.logger.warn(f"Skipping {entryPath}: {e}")
+                    stats["Skipped"] += 1
+                    continue
+
+                tarInfo.type = tarfile.REGTYPE
+                tarInfo.linkname = ""
+
+            if tarInfo.isreg():
+
+                try:
+
+                    if fileFilter is not None and not fileFilter(entryPath, entryArcName):
+
+                        stats["Unchanged"] += 1
+                        continue
+
+                    sourceFile = open(entryPath, "rb")
+
+                except OSError as e:
+
+                    self.logger.warn(f"Skipping {entryPath}: {e}")
+                    stats["Skipped"] += 1
+                    stats["SkippedPaths"].append(entryPath)
+                    continue
+
+                with sourceFile:
+
+                    reader = FixedSizeReader(sourceFile, tarInfo.size)
+                    self.archive.addfile(tarInfo, io.BufferedReader(reader, STREAM_BUFFER_SIZE))
+
+                if reader.shortfall:
+
+                    self.logger.warn(f"File {entryPath} shrank by {reader.shortfall} bytes while packing. Padded with zeros.")
+
+                stats["Files"] += 1
+                stats["Bytes"] += tarInfo.size
+
+            else:
+
+                self.archive.addfile(tarInfo)
+
+            if tarInfo.isdir():
+
+                try:
+
+                    with os.scandir(entryPath) as scanner:
+                        childNames = sorted(entry.name for entry in scanner)
+
+                except OSError as e:
+
+                    self.logger.warn(f"Cannot list {entryPath}: {e}")
+                    stats["Skipped"] += 1
+                    continue
+
+                # Pushed in reverse so entries are written in sorted order
+
+                for childName in reversed(childNames):
+
+                    pendingEntries.append((f"{entryArcName}/{childName}", os.path.join(entryPath, childName)))
+
+        self.logger.debug(f"Path {path} added to package as {arcName}: {stats['Files']} files, {stats['Bytes']} bytes, {stats['Unchanged']} unchanged, {stats['Skipped']} skipped.")
+
+        return stats
+
+    def addMember(self, tarInfo: tarfile.TarInfo, fileobj=None):
+
+        self.archive.addfile(tarInfo, fileobj)
+
+    def addBytes(self, arcName: str, data: bytes):
+
+        tarInfo = tarfile.TarInfo(arcName)
+        tarInfo.size = len(data)
+        tarInfo.mtime = int(time.time())
+        tarInfo.mode = 0o644
+        self.archive.addfile(tarInfo, io.BytesIO(data))
+
+    def close(self):
+
+        self.archive.close()
+        self.compressedFile.close()
+        self.outputFile.close()
+        self.sha256 = self.outputFile.sha256.hexdigest()
+        self.size = self.outputFile.size
+        os.replace(self.tempPath, self.archivePath)
+        self.logger.debug(f"Package {self.archivePath} written successfully.")
+
+    def abort(self):
+
+        try:
+
+            self.archive.close()
+            self.compressedFile.close()
+
+        finally:
+
+            self.outputFile.close()
+
+            if os.path.exists(self.tempPath):
+
+                os.remove(self.tempPath)
+
+            self.logger.warn(f"Package {self.archivePath} aborted. Partial archive removed.")
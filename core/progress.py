@@ -0,0 +1,70 @@
+import queue
+import threading
+
+class ProgressBus:
+
+    def __init__(self):
+
+        # Workers publish from any thread. The UI drains the queue on its own loop,
+        # headless consumers are called directly in the publishing thread.
+
+        self.events = queue.SimpleQueue()
+        self.subscribers = []
+        self.lock = threading.Lock()
+
+    def subscribe(self, callback):
+
+        with self.lock:
+            self.subscribers.append(callback)
+
+    def unsubscribe(self, callback):
+
+        with self.lock:
+            self.subscribers.remove(callback)
+
+    def publish(self, stepMessage: str | None = None, stepCount: float = 1.0):
+
+        self.events.put((stepMessage, stepCount))
+
+        with self.lock:
+            subscribers = list(self.subscribers)
+
+        for callback in subscribers:
+
+            callback(stepMessage, stepCount)
+
+    def close(self):
+
+        self.events.put(None)
+
+    def drain(self) -> tuple[str | None, float, bool]:
+
+        # Coalesce everything published since the last drain into one update
+
+        lastMessage = None
+        totalSteps = 0.0
+        closed = False
+
+        while True:
+
+            try:
+
+                event = self.events.get_nowait()
+
+            except queue.Empty:
+
+                break
+
+            if event is None:
+
+                closed = True
+                continue
+
+            stepMessage, stepCount = event
+            totalSteps += stepCount
+
+            if stepMessage is not None:
+
+                lastMessage = stepMessage
+
+        return lastMessage, totalSteps, closed
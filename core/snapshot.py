@@ -0,0 +1,115 @@
+import hashlib
+import maplex
+import os
+import sqlite3
+
+PENDING_ROW_LIMIT = 10000
+
+class VolumeIndex:
+
+    def __init__(self, indexPath: str, useHash: bool = False):
+
+        # Logging setup
+        self.logger = maplex.Logger(__name__)
+
+        # files holds the last packed snapshot, seen collects the snapshot being packed now.
+        # seen only replaces files once the package has been written.
+
+        self.indexPath = indexPath
+        self.useHash = useHash
+        self.pendingRows = []
+        self.connection = sqlite3.connect(indexPath)
+        self.connection.execute(
+            "CREATE TABLE IF NOT EXISTS files ("
+            "path TEXT PRIMARY KEY, arcname TEXT NOT NULL, size INTEGER, mtime_ns INTEGER, inode INTEGER, hash TEXT"
+            ") WITHOUT ROWID"
+        )
+        self.connection.execute("CREATE TEMP TABLE seen AS SELECT * FROM files WHERE 0")
+        self.connection.execute("CREATE UNIQUE INDEX temp.seen_path ON seen (path)")
+        self.connection.commit()
+
+        self.logger.debug(f"Volume index {indexPath} opened.")
+
+    def hashFile(self, filePath: str) -> str:
+
+        digest = hashlib.sha256()
+
+        with open(filePath, "rb") as f:
+            for chunk in iter(lambda: f.read(1024 * 1024), b""):
+                digest.update(chunk)
+
+        return digest.hexdigest()
+
+    def isChanged(self, filePath: str, arcName: str) -> bool:
+
+        fileStat = os.stat(filePath)
+        statKey = (fileStat.st_size, fileStat.st_mtime_ns, fileStat.st_ino)
+        row = self.connection.execute("SELECT size, mtime_ns, inode, hash FROM files WHERE path = ?", (filePath,)).fetchone()
+        fileHash = None
+
+        if row is not None and tuple(row[:3]) == statKey:
+
+            changed = False
+            fileHash = row[3]
+
+        elif self.useHash:
+
+            # Touched but identical files are not packed again when hashing is enabled
+
+            fileHash = self.hashFile(filePath)
+            changed = row is None or row[3] != fileHash
+
+        else:
+
+            changed = True
+
+        self.record(filePath, arcName, statKey, fileHash)
+
+        return changed
+
+    def record(self, filePath: str, arcName: str, statKey: tuple, fileHash: str | None):
+
+        self.pendingRows.append((filePath, arcName, *statKey, fileHash))
+
+        if len(self.pendingRows) >= PENDING_ROW_LIMIT:
+
+            self.flush()
+
+    def flush(self):
+
+        if self.pendingRows:
+
+            self.connection.executemany("INSERT OR REPLACE INTO seen VALUES (?, ?, ?, ?, ?, ?)", self.pendingRows)
+            self.pendingRows = []
+
+    def forget(self, filePath: str):
+
+        # A file that could not be packed keeps its previous record, so it is neither lost nor reported deleted
+
+        self.flush()
+        self.connection.execute("DELETE FROM seen WHERE path = ?", (filePath,))
+        self.connection.execute("INSERT INTO seen SELECT * FROM files WHERE path = ?", (filePath,))
+
+    def deletedArcNames(self) -> list:
+
+        self.flush()
+        rows = self.connection.execute(
+            "SELECT files.arcname FROM files LEFT JOIN seen ON files.path = seen.path WHERE seen.path IS NULL ORDER BY files.arcname"
+        )
+
+        return [row[0] for row in rows]
+
+    def commit(self):
+
+        self.flush()
+
+        with self.connection:
+
+            self.connection.execute("DELETE FROM files")
+            self.connection.execute("INSERT INTO files SELECT * FROM seen")
+
+        self.logger.debug(f"Volume index {self.indexPath} updated with the new snapshot.")
+
+    def close(self):
+
+        self.connection.close()
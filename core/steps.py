@@ -0,0 +1,63 @@
+import re
+import time
+
+STEP_PATTERN = re.compile(r"^Step (\d+)/(\d+) : (.*)$")
+CACHE_HIT_PATTERN = re.compile(r"^\s*---> Using cache")
+
+class BuildStepRecorder:
+
+    def __init__(self):
+
+        self.steps = []
+        self.currentStep = None
+
+    def feed(self, line: str) -> dict | None:
+
+        # Returns the step record when the line starts a new Dockerfile step
+
+        stepMatch = STEP_PATTERN.match(line.strip())
+
+        if stepMatch is not None:
+
+            self.finish()
+            instruction = stepMatch.group(3)
+            self.currentStep = {
+                "Step": int(stepMatch.group(1)),
+                "Total": int(stepMatch.group(2)),
+                "Instruction": instruction,
+                "Cached": None if instruction.upper().startswith("FROM ") else False,
+                "StartTime": time.monotonic(),
+                "Duration": 0.0
+            }
+            self.steps.append(self.currentStep)
+
+            return self.currentStep
+
+        if self.currentStep is not None and CACHE_HIT_PATTERN.match(line):
+
+            self.currentStep["Cached"] = True
+
+        return None
+
+    def finish(self):
+
+        if self.currentStep is not None:
+
+            self.currentStep["Duration"] = time.monotonic() - self.currentStep.pop("StartTime")
+            self.currentStep = None
+
+    def summary(self) -> str:
+
+        summaryLines = []
+
+        for step in self.steps:
+
+            cacheStatus = {True: "hit", False: "miss", None: "-"}[step["Cached"]]
+            summaryLines.append(f"Step {step['Step']:>3}/{step['Total']:<3} {step['Duration']:>8.2f}s  {cacheStatus:<4}  {step['Instruction'][:80]}")
+
+        cacheHits = sum(1 for step in self.steps if step["Cached"] is True)
+        cacheMisses = sum(1 for step in self.steps if step["Cached"] is False)
+        totalDuration = sum(step["Duration"] for step in self.steps)
+        summaryLines.append(f"{len(self.steps)} steps in {totalDuration:.2f}s, {cacheHits} cache hits, {cacheMisses} cache misses")
+
+        return "\n".join(summaryLines)
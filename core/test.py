@@ -1,29 +1,42 @@
-import docker
 import maplex
 import os
+import shlex
+import time
 
-import ttkbootstrap as ttk
-from ttkbootstrap.constants import *
-from ttkbootstrap.dialogs import Messagebox
+from concurrent.futures import ThreadPoolExecutor
+
+from typing import TYPE_CHECKING
 
 from statics import *
+from .client import getDockerClient
+from .compose import ComposeRunner
+from .config import configStore
+
+if TYPE_CHECKING:
 
-import PIL._tkinter_finder
+    import ttkbootstrap as ttk
 
 class TestUp:
 
-    def __init__(self, composeOptions: dict, root: ttk.Window):
+    def __init__(self, composeOptions: dict, root: "ttk.Window | None", outputCallback=None):
 
         # Logging setup
         self.logger = maplex.Logger(__name__)
         self.logger.info("Initializing TestUp App.")
 
-        self.configFile = maplex.MapleJson("config.json")
+        self.configFile = configStore
         self.config = self.configFile.read("ApplicationSettings")
 
         self.loadOptions(composeOptions)
         self.root = root
 
+        # Compose runs happen off the Tk loop, so results are left for the caller to show
+
+        self.outputCallback = outputCallback
+        self.composeRunner = None
+        self.cancelRequested = False
+        self.resultMessage = None
+
         self.logger.info("TestUp App initialized successfully.")
 
     def loadOptions(self, composeOptions: dict):
@@ -40,8 +53,8 @@ class TestUp:
 
         if not os.path.exists(self.composeFilePath):
 
-            self.logger.error(f"Docker-compose file not found at path: {self.composeFilePath}")
-            Messagebox.show_error("Docker Compose", f"Docker-compose file not found at path: {self.composeFilePath}", parent=self.root)
+            self.resultMessage = f"Docker-compose file not found at path: {self.composeFilePath}"
+            self.logger.error(self.resultMessage)
             return False
 
         self.logger.debug("Docker-compose file found.")
@@ -51,43 +64,131 @@ class TestUp:
 
         self.logger.info("Removing existing test containers if any.")
 
-        imageList = self.getImageListFromConfig()
-        client = docker.from_env()
-        
-        for image in imageList:
+        startTime = time.perf_counter()
+        imageList = [image for image in self.getImageListFromConfig() if image != ""]
+
+        if len(imageList) == 0:
 
-            self.logger.debug(f"Checking for existing images with image: {image}")
-            containerImages = client.images.list(all=True, filters={"reference": image})
-            self.logger.debug(f"Found {len(containerImages)} images with image {image}.")
-            
-            for image in containerImages:
+            self.logger.debug("No configured images to remove.")
+            return
 
-                self.logger.info(f"Removing image {image.id} with image {image}")
+        buildSettings = self.config.get(KEY_OP_BUILD, {})
+        client = getDockerClient(buildSettings.get(KEY_CLIENT_POOL_SIZE), True)
 
-                try:
+        # One listing request covers every configured reference, tags of one image are removed once
 
-                    image.remove(force=True)
-                    self.logger.info(f"Image {image.id} removed successfully.")
+        containerImages = client.images.list(all=True, filters={"reference": imageList})
+        imageMap = {image.id: image for image in containerImages}
+        self.logger.debug(f"Found {len(imageMap)} images for {len(imageList)} configured references.")
+        maxParallelRemovals = max(1, int(buildSettings.get(KEY_MAX_PARALLEL_REMOVALS, 4)))
 
-                except Exception as e:
+        with ThreadPoolExecutor(max_workers=maxParallelRemovals, thread_name_prefix="RemoveWorker") as executor:
 
-                    self.logger.error(f"Failed to remove image {image.id}: {e}")
+            removedSizeList = list(executor.map(lambda image: self.removeImage(client, image), imageMap.values()))
 
-    def runDockerComposeUp(self):
-        
-        command = f"{self.composeCommand} -f {self.composeFilePath} up -d"
-        self.logger.info(f"Running command: {command}")
-        os.system(command)
-        Messagebox.show_info("Docker process started.", "Docker Compose", parent=self.root)
+        removedCount = sum(1 for removedSize in removedSizeList if removedSize is not None)
+        removedSize = sum(removedSize for removedSize in removedSizeList if removedSize is not None)
+
+        # Layers left dangling by the removals go in a single prune
+
+        prunedCount = 0
+        prunedSize = 0
+
+        try:
+
+            pruneResult = client.images.prune(filters={"dangling": True})
+            prunedCount = len(pruneResult.get("ImagesDeleted") or [])
+            prunedSize = pruneResult.get("SpaceReclaimed") or 0
+
+        except Exception as e:
+
+            self.logger.error(f"Failed to prune dangling images: {e}")
+
+        elapsedTime = time.perf_counter() - startTime
+        cleanupReport = f"Removed {removedCount} of {len(imageMap)} images (about {removedSize / 1048576:.1f} MB) and pruned {prunedCount} dangling images ({prunedSize / 1048576:.1f} MB) in {elapsedTime:.2f}s."
+        self.logger.info(cleanupReport)
+
+        if self.outputCallback is not None:
+
+            self.outputCallback(cleanupReport)
+
+    def removeImage(self, client, image) -> int | None:
+
+        # Returns the image size, shared layers make it an upper bound of the space freed
+
+        self.logger.info(f"Removing image {image.id} with tags {', '.join(image.tags) or 'none'}")
+
+        try:
+
+            client.images.remove(image=image.id, force=True)
+            self.logger.info(f"Image {image.id} removed successfully.")
+            return image.attrs.get("Size", 0)
+
+        except Exception as e:
+
+            self.logger.error(f"Failed to remove image {image.id}: {e}")
+            return None
+
+    def runCompose(self, composeArguments: list, actionName: str) -> bool:
+
+        commandList = shlex.split(self.composeCommand) + ["-f", self.composeFilePath] + composeArguments
+        self.composeRunner = ComposeRunner(self.outputCallback)
+
+        if self.cancelRequested:
+
+            self.composeRunner.cancel()
+
+        try:
+
+            exitCode = self.composeRunner.run(commandList)
+
+        except Exception as e:
+
+            self.logger.ShowError(e, f"Failed to run docker-compose {actionName}")
+            self.resultMessage = f"Failed to run docker-compose {actionName}: {e}"
+            return False
+
+        if exitCode is None:
+
+            self.resultMessage = f"Docker-compose {actionName} was cancelled."
+            return False
+
+        if exitCode != 0:
+
+            self.resultMessage = f"Docker-compose {actionName} failed with exit code {exitCode}."
+            self.logger.error(self.resultMessage)
+            return False
+
+        return True
+
+    def cancel(self):
+
+        self.cancelRequested = True
+
+        if self.composeRunner is not None:
+
+            self.logger.info("Cancelling the running docker-compose command.")
+            self.composeRunner.cancel()
+
+    def runDockerComposeUp(self) -> bool:
+
+        if not self.runCompose(["up", "-d"], "up"):
+
+            return False
+
+        self.resultMessage = "Docker process started."
         self.logger.info("Docker-compose up process initiated.")
+        return True
+
+    def runDockerComposeDown(self) -> bool:
 
-    def runDockerComposeDown(self):
+        if not self.runCompose(["down"], "down"):
 
-        command = f"{self.composeCommand} -f {self.composeFilePath} down"
-        self.logger.info(f"Running command: {command}")
-        os.system(command)
-        Messagebox.show_info("Docker process stopped.", "Docker Compose", parent=self.root)
+            return False
+
+        self.resultMessage = "Docker process stopped."
         self.logger.info("Docker-compose down process initiated.")
+        return True
 
     def getImageListFromConfig(self):
 
@@ -99,33 +200,35 @@ class TestUp:
 
         return imageList
         
-    def up(self):
+    def up(self) -> bool:
 
         self.logger.info("Starting docker-compose up process.")
+        self.cancelRequested = False
         
         if not self.checkDockerComposeFile():
-            return
+            return False
 
         if not self.skipExisting:
 
             self.removeExistingContainers()
 
-        self.runDockerComposeUp()
+        return self.runDockerComposeUp()
 
-    def down(self):
+    def down(self) -> bool:
 
         self.logger.info("Starting docker-compose down process.")
+        self.cancelRequested = False
         
         if not self.checkDockerComposeFile():
-            return
+            return False
 
-        self.runDockerComposeDown()
+        return self.runDockerComposeDown()
 
 # Instance getter for TestUp
 
 testUpInstance = {}
 
-def getTestUpInstance(name, composeOptions: dict, root: ttk.Window):
+def getTestUpInstance(name, composeOptions: dict, root: "ttk.Window | None", outputCallback=None):
     if name not in testUpInstance:
-        testUpInstance[name] = TestUp(composeOptions, root)
+        testUpInstance[name] = TestUp(composeOptions, root, outputCallback)
     return testUpInstance[name]
\ No newline at end of file
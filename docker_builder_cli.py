@@ -0,0 +1,224 @@
+import argparse
+import json
+import maplex
+import os
+import sys
+import threading
+
+from statics import *
+from core import BuildUp, TestUp, configStore
+
+# Headless entry point for cron jobs and CI runners, nothing here may import ttkbootstrap or PIL
+
+class ConsoleProgress:
+
+    def __init__(self, totalSteps: float):
+
+        self.totalSteps = max(totalSteps, 1)
+        self.currentStep = 0.0
+        self.lock = threading.Lock()
+
+    def __call__(self, stepMessage: str | None, stepCount: float):
+
+        with self.lock:
+
+            self.currentStep += stepCount
+
+            if stepMessage is not None:
+
+                percent = min(self.currentStep / self.totalSteps * 100, 100.0)
+                print(f"[{percent:5.1f}%] {stepMessage}", flush=True)
+
+class dockerBuilderCli:
+
+    def __init__(self):
+
+        # Logging setup
+        self.logger = maplex.Logger(__name__)
+
+        self.configFile = configStore
+        self.config = self.configFile.read(KEY_OP_APPLICATION)
+        self.imageList = self.config.get(KEY_OP_IMAGES, [])
+
+    def createParser(self) -> argparse.ArgumentParser:
+
+        parser = argparse.ArgumentParser(description="Build, package and test the configured Docker images without the UI.")
+        subparsers = parser.add_subparsers(dest="command", required=True)
+
+        subparsers.add_parser("list", help="list the configured images")
+
+        buildParser = subparsers.add_parser("build", help="build and package images")
+        buildParser.add_argument("--all", action="store_true", help="build every image and package them all together")
+        buildParser.add_argument("--build", action="append", default=[], metavar="NAME", help="build the named image")
+        buildParser.add_argument("--release", action="append", default=[], metavar="NAME", help="build the named image as a release")
+        buildParser.add_argument("--delete", action="append", default=[], metavar="NAME", help="delete existing packages of the named image")
+        buildParser.add_argument("--pack-volumes", action="append", default=[], metavar="NAME", help="pack the volumes of the named image")
+        buildParser.add_argument("--version", action="append", default=[], metavar="NAME=VERSION", help="override the version of the named image")
+        buildParser.add_argument("--options-file", default=None, help="JSON file with the options the build menu gathers, overrides the flags above")
+        buildParser.add_argument("--resume", action="store_true", help="continue an interrupted build from its journal, skipping completed phases")
+
+        testParser = subparsers.add_parser("test", help="start or stop the compose test environment")
+        testParser.add_argument("action", choices=["up", "down"])
+        testParser.add_argument("--skip-existing", action="store_true", help="keep existing images of the configured base images")
+
+        loadParser = subparsers.add_parser("load", help="load image packages on a target host")
+        loadParser.add_argument("packages", nargs="+", metavar="PACKAGE", help="image packages, delta release packages oldest release first")
+        loadParser.add_argument("--store", default="./layer_store", help="layer store of this host, kept between deliveries")
+        loadParser.add_argument("--output", default=None, metavar="DIRECTORY", help="write the assembled save archives here instead of loading them into Docker")
+        loadParser.add_argument("--keep", type=int, default=2, help="releases per image whose layers stay in the store")
+
+        return parser
+
+    def gatherBuildOptions(self, arguments, parser: argparse.ArgumentParser) -> dict:
+
+        # Produces the same structure as buildMenu.gatherOptions
+
+        if arguments.options_file is not None:
+
+            with open(arguments.options_file, "r") as f:
+                buildOptions = json.load(f)
+
+            if arguments.resume:
+
+                buildOptions.setdefault(KEY_OP_COMMON, {})[KEY_COM_RESUME] = True
+
+            return buildOptions
+
+        imageNameList = [image.get(KEY_NAME, f"Image {index+1}") for index, image in enumerate(self.imageList)]
+        versionMap = {}
+
+        for versionOption in arguments.version:
+
+            imageName, separator, version = versionOption.rpartition("=")
+
+            if separator == "":
+
+                parser.error(f"Version option {versionOption} is not in NAME=VERSION form.")
+
+            versionMap[imageName] = version
+
+        for imageName in arguments.build + arguments.release + arguments.delete + arguments.pack_volumes + list(versionMap):
+
+            if imageName not in imageNameList:
+
+                parser.error(f"Unknown image {imageName}. Configured images: {', '.join(imageNameList)}")
+
+        imageOptions = {}
+
+        for imageName, image in zip(imageNameList, self.imageList):
+
+            imageOptions[imageName] = {
+                KEY_BUILD: arguments.all or imageName in arguments.build or imageName in arguments.release,
+                KEY_DELETE: imageName in arguments.delete,
+                KEY_RELEASE: imageName in arguments.release,
+                KEY_PACK_VOLUMES: imageName in arguments.pack_volumes and len(image.get(KEY_VOLUMES, [])) > 0,
+                KEY_VERSION: versionMap.get(imageName, image.get(KEY_VERSION, ""))
+            }
+
+        return {
+            KEY_OP_IMAGES: imageOptions,
+            KEY_OP_COMMON: {KEY_COM_BUILD_ALL: arguments.all, KEY_COM_RESUME: arguments.resume}
+        }
+
+    def listImages(self) -> int:
+
+        for index, image in enumerate(self.imageList):
+
+            volumeText = f", volumes: {', '.join(image.get(KEY_VOLUMES, []))}" if len(image.get(KEY_VOLUMES, [])) > 0 else ""
+            print(f"{image.get(KEY_NAME, f'Image {index+1}')}: {image.get(KEY_BASE_IMAGE, 'UnknownBase')} {image.get(KEY_VERSION, '')}{volumeText}")
+
+        return 0
+
+    def build(self, buildOptions: dict) -> int:
+
+        buildUp = BuildUp(buildOptions, None)
+        buildUp.progressBus.subscribe(ConsoleProgress(buildUp.getStepCount()))
+        buildUp.processBuild()
+        print(buildUp.metrics.summary())
+
+        if len(buildUp.failureList) > 0:
+
+            for failure in buildUp.failureList:
+
+                print(f"ERROR: {failure}", file=sys.stderr)
+
+            return 1
+
+        print("Build process completed successfully.")
+        return 0
+
+    def test(self, action: str, skipExisting: bool) -> int:
+
+        buildSettings = self.config.get(KEY_OP_BUILD, {})
+        composeOptions = {
+            KEY_COM_SKIP_EXISTING: skipExisting,
+            KEY_COMPOSE_FILE_PATH: buildSettings.get(KEY_COMPOSE_FILE_PATH, "./compose.yaml"),
+            KEY_COMPOSE_COMMAND: buildSettings.get(KEY_COMPOSE_COMMAND, "docker-compose")
+        }
+        testUp = TestUp(composeOptions, None)
+        succeeded = testUp.up() if action == "up" else testUp.down()
+
+        if testUp.resultMessage is not None:
+
+            print(testUp.resultMessage, file=sys.stdout if succeeded else sys.stderr)
+
+        return 0 if succeeded else 1
+
+    def load(self, packageList: list, storePath: str, outputDirectory: str | None, keepCount: int) -> int:
+
+        # The loader works without a daemon when the archives are only written out
+
+        from core.loader import PackageLoader
+
+        client = None
+
+        if outputDirectory is None:
+
+            from core.client import getDockerClient
+            client = getDockerClient()
+
+        else:
+
+            os.makedirs(outputDirectory, exist_ok=True)
+
+        packageLoader = PackageLoader(storePath, client)
+
+        for packagePath in packageList:
+
+            outputPath = os.path.join(outputDirectory, f"{os.path.basename(packagePath).split('.tar')[0]}.tar") if outputDirectory is not None else None
+            imageName = packageLoader.load(packagePath, outputPath)
+            print(f"{imageName} loaded from {packagePath}" + (f" into {outputPath}" if outputPath is not None else ""))
+
+        packageLoader.prune(keepCount)
+        return 0
+
+    def run(self, argv: list | None = None) -> int:
+
+        parser = self.createParser()
+        arguments = parser.parse_args(argv)
+
+        try:
+
+            if arguments.command == "list":
+
+                return self.listImages()
+
+            if arguments.command == "build":
+
+                return self.build(self.gatherBuildOptions(arguments, parser))
+
+            if arguments.command == "load":
+
+                return self.load(arguments.packages, arguments.store, arguments.output, arguments.keep)
+
+            return self.test(arguments.action, arguments.skip_existing)
+
+        except Exception as e:
+
+            self.logger.ShowError(e, f"{arguments.command} command failed")
+            print(f"ERROR: {e}", file=sys.stderr)
+            return 1
+
+if __name__ == "__main__":
+
+    sys.exit(dockerBuilderCli().run())
@@ -9,7 +9,7 @@ import shutil
 import PIL._tkinter_finder
 
 from statics import *
-from ui.menu import *
+from ui.menu import buildMenu
 
 class dockerBuilder:
 
@@ -108,6 +108,9 @@ class dockerBuilder:
 
         if not self.buildMenuInstance:
             self.buildMenuInstance = buildMenu(self.menu_frame)
+
+        if self.testMenuInstance:
+            self.testMenuInstance.hide()
         
         self.buildMenuInstance.show()
 
@@ -116,7 +119,11 @@ class dockerBuilder:
         self.logger.info("Test button clicked.")
 
         if not self.testMenuInstance:
+            from ui.menu import testMenu
             self.testMenuInstance = testMenu(self.menu_frame)
+
+        if self.buildMenuInstance:
+            self.buildMenuInstance.hide()
         
         self.testMenuInstance.show()
 
@@ -30,5 +30,25 @@ __all__ = [
     "KEY_BUTTON_STOP",
     "KEY_BUTTON_BUILD",
     "KEY_COMPOSE_FILE_PATH",
-    "KEY_COMPOSE_COMMAND"
+    "KEY_COMPOSE_COMMAND",
+    "KEY_OP_BUILD",
+    "KEY_MAX_PARALLEL_BUILDS",
+    "KEY_TAG_RELEASE_BUILD",
+    "KEY_BUILD_CACHE",
+    "KEY_DOCKERFILE",
+    "KEY_BUILD_ARGS",
+    "KEY_COMPRESSION_THREADS",
+    "KEY_COMPRESSION",
+    "KEY_COMPRESSION_LEVEL",
+    "KEY_COMBINED_SAVE",
+    "KEY_DELTA_RELEASE",
+    "KEY_INCREMENTAL_VOLUMES",
+    "KEY_VOLUME_HASH",
+    "KEY_CONTEXT_CACHE",
+    "KEY_OP_LOGGER",
+    "KEY_LOG_DIRECTORY",
+    "KEY_CLIENT_POOL_SIZE",
+    "KEY_MAX_PARALLEL_REMOVALS",
+    "KEY_COM_RESUME",
+    "KEY_STAGING_BUDGET"
 ]
@@ -4,6 +4,8 @@ KEY_NAME = "Name"
 KEY_BASE_IMAGE = "BaseImage"
 KEY_VOLUMES = "Volumes"
 KEY_CONTEXT_PATH = "ContextPath"
+KEY_DOCKERFILE = "Dockerfile"
+KEY_BUILD_ARGS = "BuildArgs"
 KEY_OUTPUT_DIRECTORY = "OutputDirectory"
 KEY_BUILD = "Build"
 KEY_DELETE = "Delete"
@@ -16,10 +18,12 @@ KEY_REF = "Ref"
 
 KEY_COM_SKIP_EXISTING = "SkipExisting"
 KEY_COM_BUILD_ALL = "BuildAll"
+KEY_COM_RESUME = "Resume"
 
 KEY_OP_APPLICATION = "ApplicationSettings"
 KEY_OP_IMAGES = "Images"
 KEY_OP_PACKAGE = "PackageSettings"
+KEY_OP_BUILD = "BuildSettings"
 KEY_OP_COMMON = "CommonOptions"
 KEY_OP_OWNERSHIP = "Ownership"
 KEY_OP_USER = "User"
@@ -31,3 +35,20 @@ KEY_BUTTON_BUILD = "ButtonBuild"
 
 KEY_COMPOSE_FILE_PATH = "ComposeFilePath"
 KEY_COMPOSE_COMMAND = "ComposeCommand"
+
+KEY_MAX_PARALLEL_BUILDS = "MaxParallelBuilds"
+KEY_TAG_RELEASE_BUILD = "TagReleaseBuild"
+KEY_BUILD_CACHE = "BuildCache"
+KEY_COMPRESSION_THREADS = "CompressionThreads"
+KEY_COMPRESSION = "Compression"
+KEY_COMPRESSION_LEVEL = "CompressionLevel"
+KEY_COMBINED_SAVE = "CombinedSave"
+KEY_STAGING_BUDGET = "StagingBudget"
+KEY_DELTA_RELEASE = "DeltaRelease"
+KEY_INCREMENTAL_VOLUMES = "IncrementalVolumes"
+KEY_VOLUME_HASH = "VolumeHash"
+KEY_CONTEXT_CACHE = "ContextCache"
+KEY_OP_LOGGER = "MapleLogger"
+KEY_LOG_DIRECTORY = "WorkingDirectory"
+KEY_CLIENT_POOL_SIZE = "ClientPoolSize"
+KEY_MAX_PARALLEL_REMOVALS = "MaxParallelRemovals"
@@ -0,0 +1,39 @@
+import hashlib
+import json
+import pytest
+import tarfile
+
+from statics import *
+from benchmarks.fakeDocker import FakeDockerClient
+
+def readMembers(fileobj) -> dict:
+
+    with tarfile.open(fileobj=fileobj, mode="r|") as archive:
+        return {member.name: hashlib.sha256(archive.extractfile(member).read()).hexdigest() if member.isfile() else member.type for member in archive}
+
+@pytest.fixture
+def workspace(tmp_path, monkeypatch):
+
+    # BuildUp reads config.json from the working directory, so every test gets its own
+
+    def writeConfig(imageConfigList: list, packageSettings: dict | None = None, buildSettings: dict | None = None):
+
+        configData = {
+            KEY_OP_LOGGER: {KEY_LOG_DIRECTORY: str(tmp_path / "logs")},
+            KEY_OP_APPLICATION: {
+                KEY_OP_IMAGES: imageConfigList,
+                KEY_OP_BUILD: buildSettings or {},
+                KEY_OP_PACKAGE: {KEY_OUTPUT_DIRECTORY: str(tmp_path / "packages"), KEY_COMPRESSION: "gzip", **(packageSettings or {})}
+            }
+        }
+        (tmp_path / "config.json").write_text(json.dumps(configData))
+
+    monkeypatch.chdir(tmp_path)
+    writeConfig([])
+
+    return tmp_path, writeConfig
+
+@pytest.fixture
+def fakeClient():
+
+    return FakeDockerClient()
@@ -0,0 +1,45 @@
+import os
+
+from statics import *
+from core.build import BuildUp
+
+def test_failed_all_images_package_is_reported(workspace, fakeClient):
+
+    tmp_path, writeConfig = workspace
+    (tmp_path / "context").mkdir()
+    (tmp_path / "context" / "Dockerfile").write_text("FROM scratch\n")
+    writeConfig(
+        [{KEY_NAME: "Sample Image", KEY_BASE_IMAGE: "sample", KEY_VERSION: "1.0.0", KEY_CONTEXT_PATH: str(tmp_path / "context")}],
+        {KEY_COMBINED_SAVE: True, KEY_STAGING_BUDGET: 1},
+        {KEY_BUILD_CACHE: True}
+    )
+    buildUp = BuildUp({KEY_OP_IMAGES: {}, KEY_OP_COMMON: {KEY_COM_BUILD_ALL: True}}, None, fakeClient)
+    buildUp.streamBuild = lambda fullImageName, **buildOptions: fakeClient.images.create(fullImageName, 4096, 0.5)
+
+    buildUp.processBuild()
+
+    assert any(failure.startswith("Failed to package all images") for failure in buildUp.failureList)
+    assert os.path.exists(os.path.join(buildUp.packagePath, ".build_cache.json"))
+    assert os.path.exists(os.path.join(buildUp.packagePath, ".file_hashes.json"))
+
+def test_dockerfile_and_build_args_reach_the_daemon(workspace, fakeClient):
+
+    tmp_path, writeConfig = workspace
+    (tmp_path / "context").mkdir()
+    (tmp_path / "context" / "Build.Dockerfile").write_text("ARG VERSION\nFROM scratch\n")
+
+    for useContextCache in (False, True):
+
+        writeConfig(
+            [{KEY_NAME: "Sample Image", KEY_BASE_IMAGE: "sample", KEY_VERSION: "1.0.0", KEY_CONTEXT_PATH: str(tmp_path / "context"), KEY_DOCKERFILE: "Build.Dockerfile", KEY_BUILD_ARGS: {"VERSION": "1.0.0"}}],
+            buildSettings={KEY_CONTEXT_CACHE: useContextCache}
+        )
+        buildOptionList = []
+        buildUp = BuildUp({KEY_OP_IMAGES: {"Sample Image": {KEY_BUILD: True}}, KEY_OP_COMMON: {}}, None, fakeClient)
+        buildUp.streamBuild = lambda fullImageName, **buildOptions: buildOptionList.append(buildOptions) or fakeClient.images.create(fullImageName, 4096, 0.5)
+
+        buildUp.processBuild()
+
+        assert buildUp.failureList == []
+        assert buildOptionList[0]["dockerfile"] == "Build.Dockerfile"
+        assert type(buildOptionList[0]["buildargs"]) is dict and buildOptionList[0]["buildargs"] == {"VERSION": "1.0.0"}
@@ -0,0 +1,37 @@
+import json
+
+from core.cache import BuildCache, FileHashCache
+from core.config import ConfigStore
+
+def writeContext(tmp_path):
+
+    contextPath = tmp_path / "context"
+    contextPath.mkdir()
+    (contextPath / "Dockerfile").write_text("FROM scratch\nCOPY app.txt /app.txt\n")
+    (contextPath / "app.txt").write_text("hello\n")
+
+    return contextPath
+
+def test_compute_key_accepts_build_args_from_config_store(tmp_path):
+
+    # Regression: BuildArgs read through the config store are frozen and must still hash
+
+    contextPath = writeContext(tmp_path)
+    configPath = tmp_path / "config.json"
+    buildArgs = {"VERSION": "1.0.0", "FLAGS": {"Debug": False}}
+    configPath.write_text(json.dumps({"ApplicationSettings": {"Images": [{"Name": "Sample Image", "BuildArgs": buildArgs}]}}))
+
+    imageConfig = ConfigStore(str(configPath)).read("ApplicationSettings")["Images"][0]
+    buildCache = BuildCache(str(tmp_path / "build_cache.json"), FileHashCache(str(tmp_path / "file_hashes.json")))
+
+    frozenKey = buildCache.computeKey(str(contextPath), "Dockerfile", imageConfig["BuildArgs"])
+    plainKey = buildCache.computeKey(str(contextPath), "Dockerfile", buildArgs)
+
+    assert frozenKey == plainKey
+
+def test_compute_key_changes_with_build_args(tmp_path):
+
+    contextPath = writeContext(tmp_path)
+    buildCache = BuildCache(str(tmp_path / "build_cache.json"), FileHashCache(str(tmp_path / "file_hashes.json")))
+
+    assert buildCache.computeKey(str(contextPath), "Dockerfile", {"VERSION": "1"}) != buildCache.computeKey(str(contextPath), "Dockerfile", {"VERSION": "2"})
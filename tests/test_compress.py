@@ -0,0 +1,30 @@
+import gzip
+import os
+import pytest
+import random
+
+from core.compress import ParallelGzipWriter
+
+@pytest.mark.parametrize("blockSize", [1024, 4096, 65536])
+@pytest.mark.parametrize("dataSize", [0, 100, 1024, 10000, 200000])
+def test_parallel_gzip_round_trips(tmp_path, blockSize, dataSize):
+
+    # Blocks are deflated apart, primed with the previous block and joined by sync flushes
+
+    randomSource = random.Random(dataSize)
+    data = bytes(randomSource.choice(b"abcdefgh") for _ in range(dataSize // 2)) + os.urandom(dataSize - dataSize // 2)
+    archivePath = tmp_path / "data.gz"
+
+    with open(archivePath, "wb") as f:
+
+        gzipWriter = ParallelGzipWriter(f, level=6, threads=3, blockSize=blockSize)
+
+        # Uneven writes so blocks are split across write calls
+
+        for offset in range(0, dataSize, 777):
+
+            gzipWriter.write(data[offset:offset + 777])
+
+        gzipWriter.close()
+
+    assert gzip.decompress(archivePath.read_bytes()) == data
@@ -0,0 +1,28 @@
+import os
+
+from core.cache import FileHashCache
+from core.context import ContextCache
+
+def test_images_sharing_a_context_keep_their_own_archives(tmp_path):
+
+    # Regression: with Dockerfile* ignored, each Dockerfile filters the shared context differently
+
+    contextPath = tmp_path / "context"
+    contextPath.mkdir()
+    (contextPath / "Dockerfile.a").write_text("FROM scratch\nCOPY app.txt /a.txt\n")
+    (contextPath / "Dockerfile.b").write_text("FROM scratch\nCOPY app.txt /b.txt\n")
+    (contextPath / "app.txt").write_text("hello\n")
+    (contextPath / ".dockerignore").write_text("Dockerfile*\n")
+
+    fileHashCache = FileHashCache(str(tmp_path / "file_hashes.json"))
+    contextCache = ContextCache(str(tmp_path / ".context"), fileHashCache)
+    archiveList = []
+
+    for dockerfile in ["Dockerfile.a", "Dockerfile.b"]:
+
+        contextFileList = contextCache.listFiles(str(contextPath), dockerfile)
+        fingerprint = fileHashCache.fingerprint(os.path.abspath(contextPath), contextFileList)
+        archiveList.append(contextCache.getArchive(str(contextPath), dockerfile, contextFileList, fingerprint))
+
+    assert archiveList[0] != archiveList[1]
+    assert all(os.path.exists(archivePath) for archivePath in archiveList)
@@ -0,0 +1,39 @@
+from statics import *
+from core.build import BuildUp
+from core.graph import ImageGraph
+
+def writeImages(tmp_path) -> list:
+
+    for imageName, dockerfile in (("parent", "FROM scratch\n"), ("child", "ARG BASE=parent\nFROM ${BASE}:latest AS app\nFROM app\n")):
+
+        (tmp_path / imageName).mkdir()
+        (tmp_path / imageName / "Dockerfile").write_text(dockerfile)
+
+    return [
+        {KEY_NAME: "Child", KEY_BASE_IMAGE: "child", KEY_CONTEXT_PATH: str(tmp_path / "child")},
+        {KEY_NAME: "Parent", KEY_BASE_IMAGE: "parent", KEY_CONTEXT_PATH: str(tmp_path / "parent")}
+    ]
+
+def test_graph_orders_parent_before_child(tmp_path):
+
+    imageGraph = ImageGraph(writeImages(tmp_path))
+
+    assert imageGraph.parentMap["Child"] == {"Parent"}
+    assert imageGraph.fromMap["Child"] == ["parent:latest"]
+    assert imageGraph.levels() == [["Parent"], ["Child"]]
+
+def test_rebuilt_parent_changes_child_cache_key(workspace, fakeClient):
+
+    tmp_path, writeConfig = workspace
+    imageConfigList = writeImages(tmp_path)
+    writeConfig(imageConfigList, buildSettings={KEY_BUILD_CACHE: True})
+    buildUp = BuildUp({}, None, fakeClient)
+    buildUp.imageGraph = ImageGraph(imageConfigList)
+    childPath = str(tmp_path / "child")
+
+    fakeClient.images.create("parent:latest", 1024, 0.5)
+    firstKey = buildUp.buildCache.computeKey(childPath, "Dockerfile", {}, None, buildUp.resolveFromImages("Child"))
+    fakeClient.images.create("parent-rebuilt", 1024, 0.5).tag("parent", tag="latest")
+    secondKey = buildUp.buildCache.computeKey(childPath, "Dockerfile", {}, None, buildUp.resolveFromImages("Child"))
+
+    assert firstKey != secondKey
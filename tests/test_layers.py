@@ -0,0 +1,96 @@
+import io
+import json
+import os
+import pytest
+import tarfile
+
+from statics import *
+from conftest import readMembers
+from core.build import BuildUp
+from core.loader import PackageLoader
+
+def packageRelease(fakeClient, version: str) -> tuple:
+
+    image = fakeClient.images.create(f"sample:{version}", 4096, 0.5, 2048)
+    saveMembers = readMembers(io.BytesIO(b"".join(image.save())))
+    buildUp = BuildUp({}, None, fakeClient)
+    packagePath = os.path.join(buildUp.packagePath, f"sample_{version}")
+    buildUp.builtImageList = [["Sample Image", packagePath, f"sample:{version}", False, []]]
+    buildUp.packageImages()
+
+    assert buildUp.failureList == []
+
+    return buildUp, buildUp.findPackageArchive(packagePath), saveMembers
+
+def test_loader_reassembles_delta_releases(workspace, fakeClient):
+
+    tmp_path, writeConfig = workspace
+    writeConfig([{KEY_NAME: "Sample Image", KEY_BASE_IMAGE: "sample"}], {KEY_DELTA_RELEASE: True})
+    _, firstArchive, firstMembers = packageRelease(fakeClient, "1.0.0")
+    _, secondArchive, secondMembers = packageRelease(fakeClient, "1.0.1")
+
+    with tarfile.open(secondArchive) as archive:
+        deltaManifest = json.load(archive.extractfile("delta.json"))
+
+    assert deltaManifest["BaseVersion"] == "1.0.0"
+    assert any(member.get("Included") is False for member in deltaManifest["Members"])
+
+    outputDirectory = tmp_path / "loaded"
+    outputDirectory.mkdir()
+    packageLoader = PackageLoader(str(tmp_path / "target_store"))
+
+    for archivePath, saveMembers in ((firstArchive, firstMembers), (secondArchive, secondMembers)):
+
+        outputPath = str(outputDirectory / f"{os.path.basename(archivePath)}.tar")
+        packageLoader.load(archivePath, outputPath)
+
+        with open(outputPath, "rb") as f:
+            assert readMembers(f) == saveMembers
+
+    packageLoader.prune(1)
+    assert [release["Version"] for release in packageLoader.layerStore.readIndex("sample")] == ["1.0.1"]
+
+def test_prune_drops_releases_without_packages(workspace, fakeClient):
+
+    tmp_path, writeConfig = workspace
+    writeConfig([{KEY_NAME: "Sample Image", KEY_BASE_IMAGE: "sample"}], {KEY_DELTA_RELEASE: True})
+    packageRelease(fakeClient, "1.0.0")
+    buildUp, secondArchive, _ = packageRelease(fakeClient, "1.0.1")
+    blobCount = len(os.listdir(buildUp.layerStore.blobDirectory))
+
+    os.remove(secondArchive)
+    buildUp.pruneLayerStore()
+
+    assert [release["Version"] for release in buildUp.layerStore.readIndex("sample")] == ["1.0.0"]
+    assert len(os.listdir(buildUp.layerStore.blobDirectory)) < blobCount
+
+@pytest.mark.parametrize("memberName", ["image/../../escaped.txt", "image//etc/escaped.txt", "image/blobs/../../escaped.txt"])
+def test_loader_rejects_members_outside_the_image_directory(tmp_path, memberName):
+
+    archivePath = tmp_path / "crafted.tar"
+
+    with tarfile.open(archivePath, "w") as archive:
+
+        tarInfo = tarfile.TarInfo(memberName)
+        tarInfo.size = 4
+        archive.addfile(tarInfo, io.BytesIO(b"evil"))
+
+    with pytest.raises(ValueError):
+        PackageLoader(str(tmp_path / "target_store" / "store")).load(str(archivePath), str(tmp_path / "out.tar"))
+
+    assert not (tmp_path / "escaped.txt").exists()
+    assert not (tmp_path / "target_store" / "escaped.txt").exists()
+
+@pytest.mark.parametrize("member", [{"Name": "../escaped.txt", "Type": "file", "Size": 4}, {"Name": "/etc/escaped.txt", "Type": "file", "Size": 4}, {"Name": "blob", "Type": "file", "Size": 4, "Digest": "sha256:../../escaped.txt"}])
+def test_assemble_rejects_manifest_names_outside_the_delta(tmp_path, member):
+
+    deltaDirectory = tmp_path / "delta"
+    (deltaDirectory / "image").mkdir(parents=True)
+    (tmp_path / "escaped.txt").write_text("evil")
+    (deltaDirectory / "delta.json").write_text(json.dumps({"Image": "sample:1.0.1", "Members": [member]}))
+    outputPath = tmp_path / "out.tar"
+
+    with pytest.raises(ValueError):
+        PackageLoader(str(tmp_path / "target_store")).layerStore.assemble(str(deltaDirectory), str(outputPath))
+
+    assert not outputPath.exists()
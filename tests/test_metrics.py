@@ -0,0 +1,22 @@
+import json
+
+from core.metrics import PipelineMetrics
+from core.steps import BuildStepRecorder
+
+def test_build_steps_are_written_to_the_run_record(tmp_path):
+
+    stepRecorder = BuildStepRecorder()
+
+    for line in ["Step 1/3 : FROM scratch", "Step 2/3 : COPY app.txt /app.txt", " ---> Using cache", "Step 3/3 : RUN build", " ---> Running in 0123"]:
+
+        stepRecorder.feed(line)
+
+    stepRecorder.finish()
+    metrics = PipelineMetrics()
+    metrics.recordBuildSteps("sample:latest", stepRecorder.steps)
+    metrics.write(str(tmp_path / "metrics.jsonl"))
+
+    runRecord = json.loads((tmp_path / "metrics.jsonl").read_text().splitlines()[-1])
+
+    assert [(step["Step"], step["Cached"]) for step in runRecord["BuildSteps"]["sample:latest"]] == [(1, None), (2, True), (3, False)]
+    assert all(step["Duration"] >= 0 for step in runRecord["BuildSteps"]["sample:latest"])
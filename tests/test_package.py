@@ -0,0 +1,34 @@
+import io
+import os
+
+import pytest
+
+from statics import *
+from conftest import readMembers
+from core.build import BuildUp
+from core.loader import PackageLoader
+
+@pytest.mark.parametrize("compression", ["gzip", "auto"])
+def test_image_is_exported_once_per_package(workspace, fakeClient, monkeypatch, compression):
+
+    tmp_path, writeConfig = workspace
+    writeConfig([{KEY_NAME: "Sample Image", KEY_BASE_IMAGE: "sample"}], {KEY_COMPRESSION: compression})
+    image = fakeClient.images.create("sample:latest", 4096, 0.5, 2048)
+    saveMembers = readMembers(io.BytesIO(b"".join(image.save())))
+    originalSave = image.save
+    saveCallList = []
+    monkeypatch.setattr(image, "save", lambda *args, **kwargs: saveCallList.append(kwargs) or originalSave(*args, **kwargs))
+
+    buildUp = BuildUp({}, None, fakeClient)
+    packagePath = os.path.join(buildUp.packagePath, "sample_latest")
+    buildUp.builtImageList = [["Sample Image", packagePath, "sample:latest", False, []]]
+    buildUp.packageImages()
+
+    assert buildUp.failureList == []
+    assert len(saveCallList) == 1
+
+    outputPath = str(tmp_path / "sample.tar")
+    PackageLoader(str(tmp_path / "target_store")).load(buildUp.findPackageArchive(packagePath), outputPath)
+
+    with open(outputPath, "rb") as f:
+        assert readMembers(f) == saveMembers
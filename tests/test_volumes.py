@@ -0,0 +1,51 @@
+import os
+import tarfile
+
+from statics import *
+from core.build import BuildUp
+
+def packVolumes(fakeClient, volumePath: str, packageName: str) -> list:
+
+    buildUp = BuildUp({}, None, fakeClient)
+    packagePath = os.path.join(buildUp.packagePath, packageName)
+    buildUp.builtImageList = [["Sample Image", packagePath, None, True, [volumePath]]]
+    buildUp.packageImages()
+
+    assert buildUp.failureList == []
+
+    with tarfile.open(buildUp.findPackageArchive(packagePath)) as archive:
+        return sorted(os.path.basename(name) for name in archive.getnames() if "/f" in name)
+
+def writeVolume(tmp_path):
+
+    volumePath = tmp_path / "volume"
+    volumePath.mkdir()
+
+    for index in range(3):
+
+        (volumePath / f"f{index}").write_text(str(index))
+
+    return volumePath
+
+def test_latest_package_stays_full_with_incremental_volumes(workspace, fakeClient):
+
+    tmp_path, writeConfig = workspace
+    volumePath = writeVolume(tmp_path)
+    writeConfig([{KEY_NAME: "Sample Image", KEY_BASE_IMAGE: "sample", KEY_VOLUMES: [str(volumePath)]}], {KEY_INCREMENTAL_VOLUMES: True})
+
+    assert packVolumes(fakeClient, str(volumePath), "sample_latest") == ["f0", "f1", "f2"]
+    (volumePath / "f1").write_text("changed")
+    assert packVolumes(fakeClient, str(volumePath), "sample_latest") == ["f0", "f1", "f2"]
+
+def test_release_increments_restart_after_delete(workspace, fakeClient):
+
+    tmp_path, writeConfig = workspace
+    volumePath = writeVolume(tmp_path)
+    writeConfig([{KEY_NAME: "Sample Image", KEY_BASE_IMAGE: "sample", KEY_VOLUMES: [str(volumePath)]}], {KEY_INCREMENTAL_VOLUMES: True})
+
+    assert packVolumes(fakeClient, str(volumePath), "sample_1.0.0") == ["f0", "f1", "f2"]
+    (volumePath / "f2").write_text("changed")
+    assert packVolumes(fakeClient, str(volumePath), "sample_1.0.1") == ["f2"]
+
+    BuildUp({}, None, fakeClient).deleteOldPackages("sample")
+    assert packVolumes(fakeClient, str(volumePath), "sample_1.0.2") == ["f0", "f1", "f2"]
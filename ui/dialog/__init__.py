@@ -1,3 +1,4 @@
 from .progressWindow import ProgressWindow
+from .summaryWindow import SummaryWindow
 
-__all__ = ["ProgressWindow"]
\ No newline at end of file
+__all__ = ["ProgressWindow", "SummaryWindow"]
\ No newline at end of file
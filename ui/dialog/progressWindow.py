@@ -2,11 +2,11 @@ import maplex
 import ttkbootstrap as ttk
 from ttkbootstrap.constants import *
 
-import PIL._tkinter_finder
+POLL_INTERVAL_MS = 50
 
 class ProgressWindow(ttk.Frame):
 
-    def __init__(self, titleMessage: str, steps: int):
+    def __init__(self, titleMessage: str, steps: int, progressBus=None):
 
         # Logging objects
 
@@ -40,11 +40,33 @@ class ProgressWindow(ttk.Frame):
 
         self.master.grab_set()
 
+        # Worker threads publish to the bus, the window drains it from the Tk loop
+
+        self.progressBus = progressBus
+
+        if self.progressBus is not None:
+
+            self.after(POLL_INTERVAL_MS, self.pollProgressBus)
+
+    def pollProgressBus(self):
+
+        stepMessage, stepCount, closed = self.progressBus.drain()
+
+        if stepMessage is not None or stepCount:
+
+            self.IncrementProgress(stepMessage, stepCount)
+
+        if closed:
+
+            self.closeWindow()
+
+        else:
+
+            self.after(POLL_INTERVAL_MS, self.pollProgressBus)
+
     def PackLabel(self, messageText):
 
-        self.messageLb.destroy()
-        self.messageLb = ttk.Label(self.labelContainer, text=messageText)
-        self.messageLb.pack(fill=X, expand=YES)
+        self.messageLb.config(text=messageText)
 
     def IncrementProgress(self, stepMessage: str | None = None, stepCount: float = 1.0):
 
@@ -0,0 +1,43 @@
+import maplex
+import ttkbootstrap as ttk
+from ttkbootstrap.constants import *
+
+class SummaryWindow(ttk.Frame):
+
+    def __init__(self, titleMessage: str, message: str, columns: list, rows: list):
+
+        # Logging objects
+
+        self.logger = maplex.Logger(__name__)
+
+        self.master = ttk.Toplevel(titleMessage, resizable=(True, True), topmost=True)
+
+        super().__init__(self.master, padding=(10, 10))
+        self.pack(fill=BOTH, expand=YES)
+
+        messageLb = ttk.Label(self, text=message)
+        messageLb.pack(fill=X, expand=NO)
+
+        summaryTable = ttk.Treeview(self, columns=columns, show="headings", height=min(max(len(rows), 1), 20))
+
+        for index, column in enumerate(columns):
+
+            summaryTable.heading(column, text=column)
+            summaryTable.column(column, anchor=W if index < 2 else E)
+
+        for row in rows:
+
+            summaryTable.insert("", END, values=row)
+
+        summaryTable.pack(fill=BOTH, expand=YES, pady=10)
+
+        okButton = ttk.Button(self, text="OK", command=self.closeWindow, bootstyle=SUCCESS)
+        okButton.pack()
+
+        self.logger.info("Summary window loaded.")
+
+        self.master.grab_set()
+
+    def closeWindow(self):
+
+        self.master.destroy()
@@ -1,4 +1,17 @@
 from .buildMenu import buildMenu
-from .testMenu import testMenu
+
+def __getattr__(name):
+
+    # The test menu is only imported when its tab is first opened
+
+    if name == "testMenu":
+
+        # Importing the submodule binds its module object to this name, so the class replaces it
+
+        from .testMenu import testMenu
+        globals()["testMenu"] = testMenu
+        return testMenu
+
+    raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
 
 __all__ = ["buildMenu", "testMenu"]
\ No newline at end of file
@@ -4,10 +4,8 @@ from ttkbootstrap.constants import *
 import maplex
 import os
 
-import PIL._tkinter_finder
-
 from statics import *
-from core import BuildUp
+from core import configStore
 
 class buildMenu:
 
@@ -19,22 +17,25 @@ class buildMenu:
 
         # Load configuration
 
-        self.configFile = maplex.MapleJson("config.json")
+        self.configFile = configStore
         self.readConfig()
 
         self.root = root
         self.buildInstance = None
         self.options = {}
 
-        self.logger.info("Build Menu initialized successfully.")
-
-    def cleanForm(self):
+        # The form lives in its own frame and is generated once, later shows only apply config changes
 
-        self.logger.debug("Cleaning form for fresh UI generation.")
+        self.frame = ttk.Frame(self.root)
+        self.generated = False
+        self.imageFormFrame = None
+        self.imageFrames = {}
+        self.imageOptionFrames = {}
+        self.imageConfigs = {}
+        self.imageOrder = []
+        self.setupValiables()
 
-        # Destroy all child widgets in the root frame
-        for widget in self.root.winfo_children():
-            widget.destroy()
+        self.logger.info("Build Menu initialized successfully.")
 
     def setupValiables(self):
         
@@ -45,24 +46,27 @@ class buildMenu:
         self.commonOptions = {}
         buildAllOption = {KEY_VALUE: ttk.BooleanVar(), KEY_REF: None}
         self.commonOptions[KEY_COM_BUILD_ALL] = buildAllOption
+        resumeOption = {KEY_VALUE: ttk.BooleanVar(), KEY_REF: None}
+        self.commonOptions[KEY_COM_RESUME] = resumeOption
+
+        # Image variables are keyed by image name and created with their widgets
 
         self.variableDictionary = {}
 
-        for image in self.imageList:
-
-            imageName = image.get(KEY_NAME, "Unnamed Image")
-            imageVarDict = {}
-            buildDict = {KEY_VALUE: ttk.BooleanVar(), KEY_REF: None}
-            deleteDict = {KEY_VALUE: ttk.BooleanVar(), KEY_REF: None}
-            releaseDict = {KEY_VALUE: ttk.BooleanVar(), KEY_REF: None}
-            packVolumesDict = {KEY_VALUE: ttk.BooleanVar(), KEY_REF: None}
-            versionDict = {KEY_VALUE: ttk.StringVar(), KEY_REF: None}
-            imageVarDict[KEY_BUILD] = buildDict
-            imageVarDict[KEY_DELETE] = deleteDict
-            imageVarDict[KEY_RELEASE] = releaseDict
-            imageVarDict[KEY_PACK_VOLUMES] = packVolumesDict
-            imageVarDict[KEY_VERSION] = versionDict
-            self.variableDictionary[imageName] = imageVarDict
+    def setupImageVariables(self, imageName: str):
+
+        imageVarDict = {}
+        buildDict = {KEY_VALUE: ttk.BooleanVar(), KEY_REF: None}
+        deleteDict = {KEY_VALUE: ttk.BooleanVar(), KEY_REF: None}
+        releaseDict = {KEY_VALUE: ttk.BooleanVar(), KEY_REF: None}
+        packVolumesDict = {KEY_VALUE: ttk.BooleanVar(), KEY_REF: None}
+        versionDict = {KEY_VALUE: ttk.StringVar(), KEY_REF: None}
+        imageVarDict[KEY_BUILD] = buildDict
+        imageVarDict[KEY_DELETE] = deleteDict
+        imageVarDict[KEY_RELEASE] = releaseDict
+        imageVarDict[KEY_PACK_VOLUMES] = packVolumesDict
+        imageVarDict[KEY_VERSION] = versionDict
+        self.variableDictionary[imageName] = imageVarDict
 
     def generateUI(self):
 
@@ -83,29 +87,33 @@ class buildMenu:
             build_all_selected = self.buildOptionButton.instate(['selected'])
             self.logger.debug(f"Build All option changed to: {build_all_selected}")
 
-            # Enable/disable checkbuttons based on checkbutton selection
+            for imageVarKey in self.variableDictionary:
 
-            if build_all_selected:
-                checkButtonState = DISABLED
-            else:
-                checkButtonState = NORMAL
+                self.applyBuildAllState(self.variableDictionary[imageVarKey])
 
-            for imageVarKey in self.variableDictionary:
+        self.buildOptionButton.config(command=on_checkbutton_change)
 
-                imageVarDict = self.variableDictionary[imageVarKey]
+    def applyBuildAllState(self, imageVarDict: dict):
 
-                if imageVarDict[KEY_BUILD][KEY_REF] is not None:
+        # Enable/disable checkbuttons based on checkbutton selection
 
-                    imageVarDict[KEY_BUILD][KEY_REF].config(state=checkButtonState)
+        build_all_selected = self.commonOptions[KEY_COM_BUILD_ALL][KEY_VALUE].get()
 
-                    if build_all_selected:
-                        imageVarDict[KEY_BUILD][KEY_VALUE].set(True)
+        if build_all_selected:
+            checkButtonState = DISABLED
+        else:
+            checkButtonState = NORMAL
 
-        self.buildOptionButton.config(command=on_checkbutton_change)
+        if imageVarDict[KEY_BUILD][KEY_REF] is not None:
+
+            imageVarDict[KEY_BUILD][KEY_REF].config(state=checkButtonState)
+
+            if build_all_selected:
+                imageVarDict[KEY_BUILD][KEY_VALUE].set(True)
 
     def generateMasterToggles(self):
 
-        form_frame = ttk.Frame(self.root)
+        form_frame = ttk.Frame(self.frame)
         form_frame.pack(pady=10)
 
         # Check buttons for selecting build options
@@ -117,27 +125,110 @@ class buildMenu:
         )
         self.buildOptionButton.grid(row=0, column=0, padx=10, pady=5)
         self.commonOptions[KEY_COM_BUILD_ALL][KEY_REF] = self.buildOptionButton
+        self.resumeOptionButton = ttk.Checkbutton(
+            form_frame,
+            text="Resume",
+            variable=self.commonOptions[KEY_COM_RESUME][KEY_VALUE],
+            bootstyle="primary-round-toggle"
+        )
+        self.resumeOptionButton.grid(row=0, column=1, padx=10, pady=5)
+        self.commonOptions[KEY_COM_RESUME][KEY_REF] = self.resumeOptionButton
 
     def generateImageCheckbuttons(self):
 
-        form_frame = ttk.Frame(self.root, padding=10)
-        form_frame.pack(fill=X, expand=True, pady=10)
-        frameStyleList = ["success.TFrame", "info.TFrame", "warning.TFrame"]
+        self.imageFormFrame = ttk.Frame(self.frame, padding=10)
+        self.imageFormFrame.pack(fill=X, expand=True, pady=10)
+        self.updateImageCheckbuttons()
+
+    def updateImageCheckbuttons(self):
+
+        # Rows are keyed by image name, only added, removed or changed images touch their widgets
+
+        imageNameList = [image.get(KEY_NAME, f"Image {index+1}") for index, image in enumerate(self.imageList)]
+        removedNameList = [imageName for imageName in self.imageOrder if imageName not in imageNameList]
+
+        for imageName in removedNameList:
+
+            self.imageFrames.pop(imageName).destroy()
+            self.imageOptionFrames.pop(imageName)
+            self.imageConfigs.pop(imageName)
+            self.variableDictionary.pop(imageName)
+
+        for index, (imageName, image) in enumerate(zip(imageNameList, self.imageList)):
+
+            if imageName not in self.imageFrames:
+
+                self.generateImageRow(image, index, imageName)
+
+            elif image is not self.imageConfigs[imageName] and image != self.imageConfigs[imageName]:
+
+                self.updateImageRow(image, index, imageName)
+
+        if imageNameList != self.imageOrder:
+
+            self.arrangeImageRows(imageNameList)
+
+        self.logger.debug(f"Image form updated: {len(imageNameList)} images, {len(removedNameList)} removed.")
+
+    def generateImageRow(self, image: dict, index: int, imageName: str):
+
+        self.setupImageVariables(imageName)
 
         # Checkbuttons for each images
 
-        for index, image in enumerate(self.imageList):
+        outerFrame = ttk.Frame(self.imageFormFrame, padding=1)
+        self.imageFrames[imageName] = outerFrame
+        self.imageConfigs[imageName] = image
 
-            outerFrameStyle = frameStyleList[index % len(frameStyleList)]
-            outerFrame = ttk.Frame(form_frame, style=outerFrameStyle, padding=1)
-            outerFrame.pack(fill=X, pady=5)
+        form_image_region = ttk.Frame(outerFrame, padding=5)
+        form_image_region.pack(fill=BOTH, pady=0.1, padx=0.1)
+
+        self.generateImageMasterbuttons(image, index, form_image_region)
+        self.generateOptionsForImage(image, index, form_image_region)
+        self.generateVersionEntry(image, index, form_image_region)
+        self.applyBuildAllState(self.variableDictionary[imageName])
 
-            form_image_region = ttk.Frame(outerFrame, padding=5)
-            form_image_region.pack(fill=BOTH, pady=0.1, padx=0.1)
+    def updateImageRow(self, image: dict, index: int, imageName: str):
 
-            self.generateImageMasterbuttons(image, index, form_image_region)
-            self.generateOptionsForImage(image, index, form_image_region)
-            self.generateVersionEntry(image, index, form_image_region)
+        currentVarDict = self.variableDictionary[imageName]
+        previousImage = self.imageConfigs[imageName]
+        self.imageConfigs[imageName] = image
+
+        # A new version from the config replaces the entry, other edits in the form are kept
+
+        if image.get(KEY_VERSION, "") != previousImage.get(KEY_VERSION, ""):
+
+            currentVarDict[KEY_VERSION][KEY_VALUE].set(image.get(KEY_VERSION, ""))
+
+        hasVolumes = len(image.get(KEY_VOLUMES, [])) > 0
+
+        if hasVolumes and currentVarDict[KEY_PACK_VOLUMES][KEY_REF] is None:
+
+            self.generatePackVolumesButton(currentVarDict, self.imageOptionFrames[imageName])
+
+        elif not hasVolumes and currentVarDict[KEY_PACK_VOLUMES][KEY_REF] is not None:
+
+            currentVarDict[KEY_PACK_VOLUMES][KEY_REF].destroy()
+            currentVarDict[KEY_PACK_VOLUMES][KEY_REF] = None
+            currentVarDict[KEY_PACK_VOLUMES][KEY_VALUE].set(False)
+
+    def arrangeImageRows(self, imageNameList: list):
+
+        frameStyleList = ["success.TFrame", "info.TFrame", "warning.TFrame"]
+
+        for imageName in self.imageOrder:
+
+            if imageName in self.imageFrames:
+
+                self.imageFrames[imageName].pack_forget()
+
+        for index, imageName in enumerate(imageNameList):
+
+            outerFrame = self.imageFrames[imageName]
+            outerFrame.config(style=frameStyleList[index % len(frameStyleList)])
+            outerFrame.pack(fill=X, pady=5)
+
+        self.imageOrder = imageNameList
 
     def generateImageMasterbuttons(self, image: dict, index: int, root: ttk.Frame):
             
@@ -182,17 +273,22 @@ class buildMenu:
 
         if len(imageVolumes) > 0:
 
-            packVolumesCheckButton = ttk.Checkbutton(
-                form_image_options_region,
-                text="Pack Volumes",
-                variable=currentVarDict[KEY_PACK_VOLUMES][KEY_VALUE],
-                bootstyle="info-round-toggle"
-            )
-            packVolumesCheckButton.grid(row=0, column=2, sticky=W, padx=20, pady=5)
-            currentVarDict[KEY_PACK_VOLUMES][KEY_REF] = packVolumesCheckButton
+            self.generatePackVolumesButton(currentVarDict, form_image_options_region)
 
+        self.imageOptionFrames[image.get(KEY_NAME, f"Image {index+1}")] = form_image_options_region
         self.variableDictionary[image.get(KEY_NAME, f"Image {index+1}")] = currentVarDict
 
+    def generatePackVolumesButton(self, currentVarDict: dict, root: ttk.Frame):
+
+        packVolumesCheckButton = ttk.Checkbutton(
+            root,
+            text="Pack Volumes",
+            variable=currentVarDict[KEY_PACK_VOLUMES][KEY_VALUE],
+            bootstyle="info-round-toggle"
+        )
+        packVolumesCheckButton.grid(row=0, column=2, sticky=W, padx=20, pady=5)
+        currentVarDict[KEY_PACK_VOLUMES][KEY_REF] = packVolumesCheckButton
+
     def generateVersionEntry(self, image: dict, index: int, root: ttk.Frame):
 
         currentVarDict = self.variableDictionary[image.get(KEY_NAME, f"Image {index+1}")]
@@ -215,7 +311,7 @@ class buildMenu:
 
     def generateButtons(self):
 
-        button_frame = ttk.Frame(self.root)
+        button_frame = ttk.Frame(self.frame)
         button_frame.pack(pady=10)
 
         build_button = ttk.Button(button_frame, text="Build", command=self.onBuildClick)
@@ -223,6 +319,10 @@ class buildMenu:
 
     def getBuildInstance(self):
 
+        # The core package pulls in the Docker SDK, so it is loaded on the first build
+
+        from core import BuildUp
+
         self.buildInstance = BuildUp(self.options, self.root)
 
     def gatherOptions(self):
@@ -251,7 +351,8 @@ class buildMenu:
 
         self.options[KEY_OP_IMAGES] = imageOptions
         self.options[KEY_OP_COMMON] = {
-            KEY_COM_BUILD_ALL: self.commonOptions[KEY_COM_BUILD_ALL][KEY_VALUE].get()
+            KEY_COM_BUILD_ALL: self.commonOptions[KEY_COM_BUILD_ALL][KEY_VALUE].get(),
+            KEY_COM_RESUME: self.commonOptions[KEY_COM_RESUME][KEY_VALUE].get()
         }
 
         self.buildAllSelected = self.options[KEY_OP_COMMON][KEY_COM_BUILD_ALL]
@@ -266,12 +367,26 @@ class buildMenu:
         self.gatherOptions()
         self.getBuildInstance()
         self.buildInstance.startBuild()
-        self.readConfig()
         self.show()
 
     def show(self):
 
-        self.cleanForm()
-        self.setupValiables()
-        self.generateUI()
-        self.addEvents()
+        # The config store only reparses a changed file, so an unchanged config costs no widget work
+
+        self.readConfig()
+
+        if not self.generated:
+
+            self.generateUI()
+            self.addEvents()
+            self.generated = True
+
+        else:
+
+            self.updateImageCheckbuttons()
+
+        self.frame.pack(fill=BOTH, expand=True)
+
+    def hide(self):
+
+        self.frame.pack_forget()
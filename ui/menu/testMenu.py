@@ -1,10 +1,15 @@
 import ttkbootstrap as ttk
 from ttkbootstrap.constants import *
 from ttkbootstrap.dialogs import Messagebox
+from ttkbootstrap.scrolled import ScrolledText
 import maplex
+import queue
+import threading
 
 from statics import *
-from core import TestUp
+from core import configStore
+
+POLL_INTERVAL_MS = 50
 
 class testMenu:
 
@@ -17,13 +22,25 @@ class testMenu:
 
         # Load configuration
 
-        self.configFile = maplex.MapleJson("config.json")
+        self.configFile = configStore
         self.config = self.configFile.read("ApplicationSettings")
 
         # Test instance variables
 
         self.testInstance = None
 
+        # Compose runs on a worker thread, its output lines and result reach the UI through the queue
+
+        self.outputQueue = queue.SimpleQueue()
+        self.workerThread = None
+        self.pendingDown = False
+        self.outputText = None
+
+        # The menu keeps its own frame, so switching tabs hides it instead of rebuilding it
+
+        self.frame = ttk.Frame(self.root)
+        self.generated = False
+
         # Setup variables
 
         self.refOptions = {}
@@ -41,24 +58,18 @@ class testMenu:
         self.refOptions[KEY_BUTTON_RUN] = runButton
         self.refOptions[KEY_BUTTON_STOP] = stopButton
 
-    def cleanForm(self):
-
-        self.logger.debug("Cleaning form for fresh UI generation.")
-
-        # Destroy all child widgets in the root frame
-        for widget in self.root.winfo_children():
-            widget.destroy()
-
     def generateUI(self):
 
         self.logger.debug("Generating UI elements.")
 
         self.generateCheckboxes()
         self.generateButtons()
+        self.generateOutput()
+        self.updateButtonStates()
 
     def generateCheckboxes(self):
 
-        checkbox_frame = ttk.Frame(self.root)
+        checkbox_frame = ttk.Frame(self.frame)
         checkbox_frame.pack(pady=10)
 
         skip_existing_checkbox = ttk.Checkbutton(
@@ -71,7 +82,7 @@ class testMenu:
 
     def generateButtons(self):
 
-        button_frame = ttk.Frame(self.root)
+        button_frame = ttk.Frame(self.frame)
         button_frame.pack(pady=10)
 
         test_button = ttk.Button(
@@ -91,17 +102,135 @@ class testMenu:
         stop_button.grid(row=0, column=1, padx=10)
         self.refOptions[KEY_BUTTON_STOP][KEY_REF] = stop_button
 
+    def generateOutput(self):
+
+        output_frame = ttk.Frame(self.frame, padding=10)
+        output_frame.pack(fill=BOTH, expand=True)
+
+        self.outputText = ScrolledText(output_frame, height=15, autohide=True)
+        self.outputText.pack(fill=BOTH, expand=True)
+
+    def updateButtonStates(self):
+
+        # The stop button cancels a running up, nothing can be pressed while down runs
+
+        isRunning = self.workerThread is not None
+        runState = DISABLED if isRunning else NORMAL
+        stopState = DISABLED if isRunning and (self.testInstance is None or self.pendingDown) else NORMAL
+
+        for buttonKey, buttonState in ((KEY_BUTTON_RUN, runState), (KEY_BUTTON_STOP, stopState)):
+
+            button = self.refOptions[buttonKey][KEY_REF]
+
+            if button is not None and button.winfo_exists():
+
+                button.config(state=buttonState)
+
+    def startWorker(self, actionName: str, testInstance, action):
+
+        self.workerThread = threading.Thread(target=self.runWorker, args=(actionName, testInstance, action), daemon=True)
+        self.workerThread.start()
+        self.updateButtonStates()
+        self.root.after(POLL_INTERVAL_MS, self.pollOutput)
+
+    def runWorker(self, actionName: str, testInstance, action):
+
+        try:
+
+            succeeded = action()
+            resultMessage = testInstance.resultMessage
+
+        except Exception as e:
+
+            self.logger.ShowError(e, f"Docker compose {actionName} failed")
+            succeeded = False
+            resultMessage = f"Docker compose {actionName} failed: {e}"
+
+        self.outputQueue.put((actionName, succeeded, resultMessage))
+
+    def pollOutput(self):
+
+        finishedResult = None
+
+        while True:
+
+            try:
+
+                outputItem = self.outputQueue.get_nowait()
+
+            except queue.Empty:
+
+                break
+
+            if isinstance(outputItem, tuple):
+
+                finishedResult = outputItem
+
+            else:
+
+                self.appendOutput(outputItem)
+
+        if finishedResult is None:
+
+            self.root.after(POLL_INTERVAL_MS, self.pollOutput)
+
+        else:
+
+            self.onWorkerFinished(*finishedResult)
+
+    def appendOutput(self, outputLine: str):
+
+        if self.outputText is not None and self.outputText.winfo_exists():
+
+            self.outputText.insert(END, f"{outputLine}\n")
+            self.outputText.see(END)
+
+    def onWorkerFinished(self, actionName: str, succeeded: bool, resultMessage: str | None):
+
+        self.logger.info(f"Docker compose {actionName} finished, succeeded: {succeeded}.")
+        self.workerThread = None
+
+        if self.pendingDown:
+
+            # The cancelled up is followed by the requested down
+
+            self.pendingDown = False
+            self.startDown()
+            return
+
+        self.updateButtonStates()
+
+        if succeeded:
+
+            Messagebox.show_info(resultMessage, "Docker Compose", parent=self.root)
+
+        else:
+
+            Messagebox.show_error(resultMessage or f"Docker compose {actionName} failed.", "Docker Compose", parent=self.root)
+
+    def startDown(self):
+
+        testInstance = self.testInstance
+        self.testInstance = None
+        self.startWorker("down", testInstance, testInstance.down)
+
     def getTestInstance(self):
 
         if self.testInstance is None:
 
-            self.testInstance = TestUp(self.options, self.root)
+            # The core package pulls in the Docker SDK, so it is loaded on the first test run
+
+            from core import TestUp
+
+            self.testInstance = TestUp(self.options, self.root, self.outputQueue.put)
 
     def onTestClick(self):
 
         self.logger.info("Test button clicked.")
-        testButton = self.refOptions[KEY_BUTTON_RUN][KEY_REF]
-        testButton.config(state=DISABLED)
+
+        if self.workerThread is not None:
+
+            return
 
         # Get options
 
@@ -114,28 +243,42 @@ class testMenu:
         # Run tests
 
         self.getTestInstance()
-        self.testInstance.up()
-        testButton.config(state=NORMAL)
+        self.startWorker("up", self.testInstance, self.testInstance.up)
 
     def stopTests(self):
 
         self.logger.info("Stop Tests button clicked.")
-        stopButton = self.refOptions[KEY_BUTTON_STOP][KEY_REF]
-        stopButton.config(state=DISABLED)
+
+        if self.workerThread is not None:
+
+            # A running up is cancelled first, down starts once it has stopped
+
+            if self.testInstance is not None and not self.pendingDown:
+
+                self.pendingDown = True
+                self.testInstance.cancel()
+                self.updateButtonStates()
+
+            return
 
         if self.testInstance:
 
-            self.testInstance.down()
-            self.testInstance = None
+            self.startDown()
 
         else:
 
             self.logger.warn("No test instance found to stop.")
             Messagebox.show_warning("No test instance is currently running.", "Stop Tests", parent=self.root)
 
-        stopButton.config(state=NORMAL)
-
     def show(self):
 
-        self.cleanForm()
-        self.generateUI()
\ No newline at end of file
+        if not self.generated:
+
+            self.generateUI()
+            self.generated = True
+
+        self.frame.pack(fill=BOTH, expand=True)
+
+    def hide(self):
+
+        self.frame.pack_forget()
\ No newline at end of file